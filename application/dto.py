@@ -11,6 +11,7 @@ class EnsureCollectionRequest:
     dim: Optional[int] = None
     distance: str = "Cosine"
     recreate: bool = False
+    bulk_load: bool = False
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from ..domain.models import Vector
+from ..infrastructure.config import embed_cache_size
+
+
+class EmbeddingCache:
+    """Process-local LRU cache of embedding vectors keyed by content hash.
+
+    Keys are BLAKE2b digests of ``(model, text)`` so entries never leak across
+    embedding models. A ``maxsize`` of ``0`` disables caching entirely.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = max(0, int(maxsize))
+        self._data: "OrderedDict[bytes, Vector]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Return the content-addressed cache key for ``text`` embedded by ``model``."""
+        return hashlib.blake2b(f"{model}\x00{text}".encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[Vector]]:
+        """Look up ``keys`` in order, marking hits as most recently used."""
+        if not self._maxsize:
+            return [None] * len(keys)
+        out: List[Optional[Vector]] = []
+        with self._lock:
+            for k in keys:
+                v = self._data.get(k)
+                if v is not None:
+                    self._data.move_to_end(k)
+                out.append(v)
+        return out
+
+    def put_many(self, pairs: Iterable[Tuple[bytes, Vector]]) -> None:
+        """Store ``(key, vector)`` pairs, evicting least recently used entries past ``maxsize``."""
+        if not self._maxsize:
+            return
+        with self._lock:
+            for k, v in pairs:
+                self._data[k] = v
+                self._data.move_to_end(k)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_SHARED: Optional[EmbeddingCache] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide cache, sized from EMBED_CACHE_SIZE on first use."""
+    global _SHARED
+    if _SHARED is None:
+        with _SHARED_LOCK:
+            if _SHARED is None:
+                _SHARED = EmbeddingCache(embed_cache_size())
+    return _SHARED
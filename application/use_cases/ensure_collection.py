@@ -16,12 +16,15 @@ class EnsureCollectionUseCase:
         Ensures that the specified collection exists with the correct dimension and distance metric.
 
         Uses the provided dimension or probes the embedding service for the default dimension, then creates or updates the collection as needed.
+        With ``bulk_load`` the collection is then switched to bulk-load mode (no HNSW indexing) until finalized.
 
         Args:
-            req: The request object containing collection name, dimension, distance, and recreate flag.
+            req: The request object containing collection name, dimension, distance, recreate and bulk_load flags.
 
         Returns:
             None
         """
         dim = int(req.dim or self._emb.get_dimension())
         self._store.ensure_collection(req.collection, dim, req.distance, req.recreate)
+        if req.bulk_load:
+            self._store.set_bulk_load(req.collection, True)
@@ -1,23 +1,42 @@
 from __future__ import annotations
 
+from typing import List, Optional
+
 from ..dto import QueryRequest
+from ..embedding_cache import EmbeddingCache, shared_embedding_cache
 from ...domain.interfaces import EmbeddingService, VectorStore
-from ...domain.models import Vector
+from ...domain.models import Vector, QueryResult
+from ...infrastructure.config import embed_model
 
 
 class QueryMemoryUseCase:
     """Use-case: embed query string and search the store."""
 
-    def __init__(self, embeddings: EmbeddingService, store: VectorStore) -> None:
+    def __init__(self, embeddings: EmbeddingService, store: VectorStore, cache: Optional[EmbeddingCache] = None) -> None:
         self._emb = embeddings
         self._store = store
+        self._cache = cache if cache is not None else shared_embedding_cache()
 
-    def execute(self, req: QueryRequest):
-        vec = self._emb.embed_texts([req.query])[0]
+    def embed_query(self, query: str) -> Vector:
+        """Embed ``query``, serving repeated query strings from the content-hash cache."""
+        key = EmbeddingCache.key(embed_model(), query)
+        vec = self._cache.get_many([key])[0]
+        if vec is None:
+            vec = self._emb.embed_texts([query])[0]
+            if type(vec) is not Vector:  # adapters normally return Vector already; only coerce duck-typed ones
+                vec = Vector(values=vec.values, dim=vec.dim)
+            self._cache.put_many([(key, vec)])
+        return vec
+
+    def search(self, req: QueryRequest, vec: Vector) -> List[QueryResult]:
+        """Search ``req.collection`` with an already embedded query vector."""
         return self._store.search(
             name=req.collection,
-            vector=Vector(values=vec.values, dim=vec.dim),
+            vector=vec,
             limit=req.k,
             with_payload=req.with_payload,
             score_threshold=req.score_threshold,
         )
+
+    def execute(self, req: QueryRequest):
+        return self.search(req, self.embed_query(req.query))
@@ -1,48 +1,103 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
 
 from ..dto import UpsertMemoryRequest, UpsertResponse
+from ..embedding_cache import EmbeddingCache, shared_embedding_cache
+from ...domain.errors import EmbeddingError
 from ...domain.interfaces import EmbeddingService, VectorStore
 from ...domain.models import Vector, MemoryItem, Point
-from ...infrastructure.config import payload_text_max
+from ...infrastructure.config import payload_text_max, embed_model
+
+
+@lru_cache(maxsize=32)
+def _namespace_hasher(namespace: str) -> "hashlib._Hash":
+    """SHA-1 state primed with NAMESPACE_URL and ``namespace|``; copied per ID so the prefix is hashed once."""
+    return hashlib.sha1(uuid.NAMESPACE_URL.bytes + namespace.encode("utf-8") + b"|")
 
 
 def _make_uuid(namespace: str, source: str, text: str) -> str:
-    ns = f"{namespace}|{source}|{text}"
-    return str(uuid.uuid5(uuid.NAMESPACE_URL, ns))
+    """Deterministic UUIDv5 (NAMESPACE_URL) of ``namespace|source|text``; equal to ``str(uuid.uuid5(...))``."""
+    h = _namespace_hasher(namespace).copy()
+    h.update(f"{source}|{text}".encode("utf-8"))
+    d = bytearray(h.digest()[:16])
+    d[6] = (d[6] & 0x0F) | 0x50  # version 5
+    d[8] = (d[8] & 0x3F) | 0x80  # RFC 4122 variant
+    x = d.hex()
+    return f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}"
 
 
 class UpsertMemoryUseCase:
     """Use-case: embed items, build points with deterministic UUIDv5 IDs, and upsert into the store."""
 
-    def __init__(self, embeddings: EmbeddingService, store: VectorStore) -> None:
+    def __init__(self, embeddings: EmbeddingService, store: VectorStore, cache: Optional[EmbeddingCache] = None) -> None:
         self._emb = embeddings
         self._store = store
+        self._cache = cache if cache is not None else shared_embedding_cache()
+
+    def _embed(self, texts: List[str]) -> List[Vector]:
+        """
+        Embed ``texts`` in order, serving repeats from the content-hash cache.
+
+        Only cache misses are sent to the embedding service (in one batch), each
+        distinct text once even when it repeats within the request; fresh vectors
+        are fanned back out and stored so re-indexing unchanged content skips the provider.
+
+        Raises:
+            EmbeddingError: When the provider returns a different number of vectors than requested.
+        """
+        model = embed_model()
+        keys = [EmbeddingCache.key(model, t) for t in texts]
+        vecs = self._cache.get_many(keys)
+        # Cache key -> first missing position; repeated texts share one provider slot.
+        unique: Dict[bytes, int] = {}
+        for i, v in enumerate(vecs):
+            if v is None:
+                unique.setdefault(keys[i], i)
+        if unique:
+            firsts = list(unique.values())
+            fresh = self._emb.embed_texts([texts[i] for i in firsts])
+            if not fresh and all(v is None for v in vecs):
+                return []  # nothing cached and nothing embedded: reported as an empty upsert
+            # A short answer is an error even when some texts were cached; hits are never dropped silently.
+            if len(fresh) != len(firsts):
+                raise EmbeddingError(f"Embedding provider returned {len(fresh)} vectors for {len(firsts)} texts")
+            by_key = dict(zip(unique, fresh))
+            for i, v in enumerate(vecs):
+                if v is None:
+                    vecs[i] = by_key[keys[i]]
+            self._cache.put_many(by_key.items())
+        return vecs  # type: ignore[return-value]
 
     def execute(self, req: UpsertMemoryRequest) -> UpsertResponse:
         items = req.items or []
         texts = [it.text for it in items]
-        vecs = self._emb.embed_texts(texts)
+        vecs = self._embed(texts)
         if not vecs:
             return UpsertResponse(provider="qdrant", raw={"status": "ok", "result": {"operation_id": None, "points": 0}})
-        dim = vecs[0].dim
-        for v in vecs:
-            if v.dim != dim:
-                raise ValueError(f"Inconsistent embedding dimension: got {v.dim}, expected {dim}")
+        dims = [v.dim for v in vecs]
+        dim = dims[0]
+        if dims.count(dim) != len(dims):  # C-level scan; locate the offender only on failure
+            bad = next(d for d in dims if d != dim)
+            raise ValueError(f"Inconsistent embedding dimension: got {bad}, expected {dim}")
 
         max_chars = payload_text_max()
+        idns = req.id_namespace
+        pids = [_make_uuid(idns, str(it.meta.get("source", "")), it.text) for it in items]
         points: List[Point] = []
-        for it, v in zip(items, vecs):
-            source = str(it.meta.get("source", ""))
-            pid = _make_uuid(req.id_namespace, source, it.text)
+        for it, v, pid in zip(items, vecs, pids):
             payload: Dict[str, object] = {
                 "text_preview": it.text[:max_chars],
                 "text_len": len(it.text),
                 "meta": it.meta,
             }
-            points.append(Point(id=pid, vector=Vector(values=v.values, dim=v.dim), payload=payload))
+            # Vectors are immutable; reuse the adapter's instance unless it is duck-typed.
+            if type(v) is not Vector:
+                v = Vector(values=v.values, dim=v.dim)
+            points.append(Point(id=pid, vector=v, payload=payload))
 
         raw = self._store.upsert_points(req.collection, points)
         return UpsertResponse(provider="qdrant", raw=raw)
@@ -0,0 +1,139 @@
+"""
+Scaffolding templates written by ``vector-memory new-project``.
+
+Kept out of ``cli.main`` so the large template literals are only loaded when a project is initialized.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+
+# Project-level MCP shim (./mcp_vector_memory.py)
+SHIM_CONTENT = """#!/usr/bin/env python3
+from __future__ import annotations
+import argparse, json
+from typing import Optional, Sequence
+from vector_memory.mcp.api import (
+    vector_create_collection,
+    vector_index_memory_bank,
+    vector_query,
+    vector_delete,
+)
+
+
+def run(argv: Optional[Sequence[str]] = None) -> int:
+    '''Parse CLI arguments and dispatch MCP vector memory commands.
+
+    Args:
+        argv: Optional collection of CLI arguments excluding the executable name.
+
+    Returns:
+        int: Process exit code where ``0`` indicates success and non-zero values
+            describe error states surfaced by the underlying vector memory API.
+
+    Side Effects:
+        Emits JSON payloads to standard output for result reporting.
+
+    Timeout & Retries:
+        Delegates timeout behaviour to the underlying vector memory functions.
+    '''
+    ap = argparse.ArgumentParser(description="Project MCP shim for vector_memory")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    e = sub.add_parser("ensure")
+    e.add_argument("--collection", required=True)
+    e.add_argument("--dim", type=int, default=None)
+    e.add_argument("--distance", default="Cosine")
+    e.add_argument("--recreate", action="store_true")
+
+    i = sub.add_parser("index")
+    i.add_argument("--collection", required=True)
+    i.add_argument("--directory", default="memory-bank")
+    i.add_argument("--idns", default="mem")
+    i.add_argument("--max-items", type=int, default=None)
+
+    q = sub.add_parser("query")
+    q.add_argument("--collection", required=True)
+    q.add_argument("--q", required=True)
+    q.add_argument("--k", type=int, default=5)
+    q.add_argument("--with-payload", action="store_true", default=True)
+    q.add_argument("--score-threshold", type=float, default=None)
+
+    d = sub.add_parser("delete")
+    d.add_argument("--collection", required=True)
+    d.add_argument("--ids", nargs="+", required=True)
+
+    ns = ap.parse_args(list(argv or []))
+    try:
+        if ns.cmd == "ensure":
+            print(json.dumps(vector_create_collection(ns.collection, ns.dim, ns.distance, ns.recreate), indent=2)); return 0
+        if ns.cmd == "index":
+            print(json.dumps(vector_index_memory_bank(ns.collection, ns.directory, ns.idns, ns.max_items), indent=2)); return 0
+        if ns.cmd == "query":
+            print(json.dumps(vector_query(ns.collection, ns.q, ns.k, ns.with_payload, ns.score_threshold), indent=2)); return 0
+        if ns.cmd == "delete":
+            print(json.dumps(vector_delete(ns.collection, ns.ids), indent=2)); return 0
+        print(json.dumps({"status":"error","error":f"Unknown cmd: {ns.cmd}"})); return 2
+    except Exception as ex:
+        print(json.dumps({"status":"error","error":f"{type(ex).__name__}: {ex}"})); return 3
+
+
+def _main_entry(argv: Optional[Sequence[str]] = None) -> int:
+    '''Internal helper that bridges ``main`` to ``run`` for reuse in tests.'''
+
+    return run(argv)
+
+
+def main():
+    '''Entrypoint for the generated MCP shim.
+
+    Returns:
+        int: Exit status propagated from ``run``.
+
+    Side Effects:
+        Reads arguments from ``sys.argv`` and exits via ``SystemExit`` upon completion.
+    '''
+
+    import sys
+
+    return _main_entry(sys.argv[1:])
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+"""
+
+
+def generate_doc(primary_collection: str, extra: List[str]) -> str:
+    """Render VECTOR_MEMORY_MCP.md for ``primary_collection`` and the ``extra`` env-declared collections."""
+    extras_line = ("\\n- " + "\\n- ".join(extra)) if extra else " (none configured)"
+    return f"""# Vector Memory MCP Usage
+
+This project initializes vector memory using environment-based collection resolution.
+
+Collections
+- Primary: {primary_collection}
+- Additional:{extras_line}
+
+Environment variables
+- MEMORY_COLLECTION_NAME: required. Primary collection name.
+- MEMORY_COLLECTION_NAME_2..N: optional additional collection names.
+- QDRANT_URL (default http://localhost:6333)
+- OLLAMA_URL (default http://localhost:11434)
+- EMBED_MODEL (default mxbai-embed-large)
+
+CLI
+- Ensure/create (uses probed embedding dimension):
+  vector-memory ensure-collection --name "$MEMORY_COLLECTION_NAME"
+- Remember (defaults to primary collection when --name omitted):
+  vector-memory remember --text "Atomic fact to remember"
+- Recall (defaults to primary collection when --name omitted):
+  vector-memory recall --q "question" --k 8 --with-payload
+
+MCP shim (CLI)
+- The file ./mcp_vector_memory.py exposes ensure, index, query, delete.
+- Agents can call it with the same env-based collection policy.
+
+Policy
+- If MEMORY_COLLECTION_NAME is not set (env or .env), commands that need a collection will fail and instruct you to set it.
+"""
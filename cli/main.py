@@ -1,55 +1,138 @@
 from __future__ import annotations
 
 import contextlib
+import operator
 import os
 import json
-import requests
-from datetime import timezone
+import sys
+from collections import ChainMap, deque
 from pathlib import Path
-from typing import Any, Optional, Sequence, Dict, List
-from datetime import datetime
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
-from ..infrastructure.logging import get_logger
 from ..infrastructure.ollama.client import OllamaEmbeddingService
-from ..infrastructure.qdrant.client import QdrantVectorStore
+from ..infrastructure.qdrant.factory import make_vector_store
 from ..infrastructure.timeouts import http_timeout_seconds, operation_timeout
-from ..infrastructure.config import qdrant_url, chat_chunk_chars
+from ..infrastructure.config import qdrant_url, chat_chunk_chars, embed_batch_size, parse_kv_text
+from ..infrastructure.http import HTTP_POOL_SIZE, http_session
+from ..infrastructure.ttl_cache import TTLCache
 from ..ingestion.memory_bank_loader import load_memory_items
-from ..domain.models import MemoryItem
+from ..domain.models import MemoryItem, QueryResult
 from ..application.dto import EnsureCollectionRequest, UpsertMemoryRequest, QueryRequest
 from ..application.use_cases.ensure_collection import EnsureCollectionUseCase
 from ..application.use_cases.upsert_memory import UpsertMemoryUseCase
 from ..application.use_cases.query_memory import QueryMemoryUseCase
 from .parsers import build_parser
 
-logger = get_logger("vector_memory.cli")
+try:  # optional C-accelerated JSON; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+
+# Reusable stdlib encoders keyed by indent; compact separators match orjson's output.
+_JSON_ENCODERS = {None: json.JSONEncoder(separators=(",", ":")), 2: json.JSONEncoder(indent=2)}
+
+
+def _dumps_std(obj: Any, indent: Optional[int] = None) -> str:
+    enc = _JSON_ENCODERS.get(indent)
+    return enc.encode(obj) if enc is not None else json.dumps(obj, indent=indent)
+
+
+def _dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Serialize ``obj`` for CLI output as ASCII-only JSON (non-ASCII escaped, like ``json.dumps``).
+
+    orjson is used when available. It cannot escape non-ASCII text, so such documents go
+    through stdlib json; either way the output is the same whether or not orjson is installed.
+    """
+    if orjson is not None and indent in (None, 2):
+        with contextlib.suppress(TypeError):
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+            if data.isascii():
+                return data.decode("ascii")
+    return _dumps_std(obj, indent)
+
+
+def _loads(raw: str | bytes) -> Any:
+    """Parse JSON text, using orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _stdout_is_tty() -> bool:
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):  # replaced or closed stream
+        return False
+
+
+def _emit(obj: Any, indent: Optional[int] = None) -> None:
+    """Write ``obj`` as one JSON document (plus newline) to stdout.
+
+    Indentation is only applied when stdout is a terminal; piped output (agents, ``jq``) is
+    compact. The document is written to ``sys.stdout.buffer`` as UTF-8 bytes in a single
+    write whatever its size, so the stream's text encoding never matters.
+    """
+    if indent and not _stdout_is_tty():
+        indent = None
+    data = (_dumps(obj, indent) + "\n").encode("utf-8")
+    buf = getattr(sys.stdout, "buffer", None)
+    sys.stdout.flush()
+    if buf is None:  # text-only stand-in (e.g. io.StringIO)
+        sys.stdout.write(data.decode("utf-8"))
+        sys.stdout.flush()
+        return
+    buf.write(data)
+    buf.flush()
+
+
+# Env keys declaring additional collections (MEMORY_COLLECTION_NAME_2..N).
+_COLL_PREFIX = "MEMORY_COLLECTION_NAME_"
+
+# Parsed .env files keyed by absolute path -> ((st_mtime_ns, st_size), parsed mapping)
+_DOTENV_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
 
 
 def _parse_dotenv(dotenv_path: Path) -> Dict[str, str]:
-    """Parse a simple .env file (KEY=VALUE per line, '#' comments, quotes stripped)."""
-    env: Dict[str, str] = {}
-    if dotenv_path.exists():
-        with contextlib.suppress(Exception):
-            for raw in dotenv_path.read_text(encoding="utf-8", errors="ignore").splitlines():
-                s = raw.strip()
-                if not s or s.startswith("#") or "=" not in s:
-                    continue
-                k, v = s.split("=", 1)
-                k = k.strip()
-                v = v.strip().strip('"').strip("'")
-                if k:
-                    env[k] = v
+    """Parse a simple .env file (KEY=VALUE per line, '#' comments, quotes stripped).
+
+    The parsed mapping is cached per absolute path and reused until the file's
+    mtime or size changes (size catches rewrites within coarse mtime granularity),
+    so repeated lookups within one process read the file once.
+    Callers must treat the returned dict as read-only.
+    """
+    try:
+        st = dotenv_path.stat()
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(dotenv_path.absolute())
+    cached = _DOTENV_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        text = dotenv_path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:  # unreadable (permissions, a directory named .env, ...): treat as absent
+        return {}
+    env = parse_kv_text(text)
+    _DOTENV_CACHE[key] = (stamp, env)
     return env
 
 
+def _env_view() -> ChainMap:
+    """Merged lookup over process env then ./.env (the .env mapping is cached per mtime/size)."""
+    return ChainMap(os.environ, _parse_dotenv(Path(".env")))
+
+
 def _env_get(key: str) -> Optional[str]:
     """Get environment value from process env, falling back to .env in CWD."""
-    v = os.getenv(key)
-    if v is not None and v.strip():
-        return v.strip()
-    local = _parse_dotenv(Path(".env"))
-    v2 = local.get(key)
-    return v2.strip() if v2 is not None and v2.strip() else None
+    # Walk the layers so a blank process value still falls back to .env.
+    for layer in _env_view().maps:
+        v = layer.get(key)
+        if v is not None and v.strip():
+            return v.strip()
+    return None
 
 
 def _resolve_collection_name(explicit: Optional[str]) -> str:
@@ -64,28 +147,10 @@ def _resolve_collection_name(explicit: Optional[str]) -> str:
 
 def _list_additional_collections() -> List[str]:
     """List configured additional collections from env/.env (MEMORY_COLLECTION_NAME_2+)."""
-    out: List[str] = []
-    merged: Dict[str, str] = {}
-    merged.update(_parse_dotenv(Path(".env")))
-    # Process env last to allow overriding
-    for k, v in os.environ.items():
-        if isinstance(k, str) and isinstance(v, str):
-            merged[k] = v
-    out.extend(
-        v.strip()
-        for k, v in merged.items()
-        if k.startswith("MEMORY_COLLECTION_NAME_")
-        and isinstance(v, str)
-        and v.strip()
-    )
-    # de-duplicate preserving order
-    seen: set[str] = set()
-    uniq: List[str] = []
-    for n in out:
-        if n not in seen:
-            seen.add(n)
-            uniq.append(n)
-    return uniq
+    view = _env_view()  # process env shadows .env for the same key
+    # strip, drop empties, de-duplicate preserving order
+    names = (view[k].strip() for k in view if k.startswith(_COLL_PREFIX))
+    return list(dict.fromkeys(n for n in names if n))
 
 
 def _allowed_collections() -> List[str]:
@@ -94,31 +159,44 @@ def _allowed_collections() -> List[str]:
     - Additional: MEMORY_COLLECTION_NAME_2..N
     Returns a de-duplicated list preserving declaration order.
     """
-    allowed: List[str] = []
     primary = _env_get("MEMORY_COLLECTION_NAME")
-    if primary and primary not in allowed:
-        allowed.append(primary)
-    for n in _list_additional_collections():
-        if n and n not in allowed:
-            allowed.append(n)
-    return allowed
+    return list(dict.fromkeys(n for n in (primary, *_list_additional_collections()) if n))
+
+
+# qdrant_url -> collection names; short TTL so one CLI run lists once.
+_COLLECTIONS_CACHE: TTLCache[List[str]] = TTLCache(5.0)
 
 
 def _list_qdrant_collections() -> List[str]:
-    """Fetch currently available Qdrant collections for helpful error messages."""
+    """Fetch currently available Qdrant collections for helpful error messages.
+
+    Successful listings are cached per Qdrant URL for a few seconds; failures are not cached.
+    """
     try:
         timeout = http_timeout_seconds()
         base = qdrant_url()
+        cached = _COLLECTIONS_CACHE.get(base)
+        if cached is not None:
+            return list(cached)
         with operation_timeout(timeout):
-            return _fetch_collections(base, timeout)
+            cols = _fetch_collections(base, timeout)
+        _COLLECTIONS_CACHE.put(base, cols)
+        return list(cols)
     except Exception:
         return []
 
+
+def _invalidate_collections_cache() -> None:
+    """Drop cached collection listings so a just-created collection is visible immediately."""
+    _COLLECTIONS_CACHE.clear()
+
+
 def _fetch_collections(base, timeout):
     """
     Fetches the list of collection names from the Qdrant server.
 
-    Sends a GET request to the Qdrant collections endpoint and returns a sorted, de-duplicated list of collection names.
+    Sends a GET request to the Qdrant collections endpoint over the shared keep-alive session
+    and returns a sorted, de-duplicated list of collection names.
 
     Args:
         base: The base URL of the Qdrant server.
@@ -127,7 +205,7 @@ def _fetch_collections(base, timeout):
     Returns:
         List[str]: Sorted list of unique collection names.
     """
-    r = requests.get(f"{base}/collections", timeout=timeout)
+    r = http_session().get(f"{base}/collections", timeout=timeout)
     r.raise_for_status()
     data = r.json() or {}
     cols = []
@@ -165,148 +243,34 @@ def _write_file_if_missing(path: Path, content: str) -> bool:
     return True
 
 
-# Template content for project-level MCP shim
-_SHIM_CONTENT = """#!/usr/bin/env python3
-from __future__ import annotations
-import argparse, json
-from typing import Optional, Sequence
-from vector_memory.mcp.api import (
-    vector_create_collection,
-    vector_index_memory_bank,
-    vector_query,
-    vector_delete,
-)
-
-
-def run(argv: Optional[Sequence[str]] = None) -> int:
-    '''Parse CLI arguments and dispatch MCP vector memory commands.
-
-    Args:
-        argv: Optional collection of CLI arguments excluding the executable name.
-
-    Returns:
-        int: Process exit code where ``0`` indicates success and non-zero values
-            describe error states surfaced by the underlying vector memory API.
-
-    Side Effects:
-        Emits JSON payloads to standard output for result reporting.
-
-    Timeout & Retries:
-        Delegates timeout behaviour to the underlying vector memory functions.
-    '''
-    ap = argparse.ArgumentParser(description="Project MCP shim for vector_memory")
-    sub = ap.add_subparsers(dest="cmd", required=True)
-
-    e = sub.add_parser("ensure")
-    e.add_argument("--collection", required=True)
-    e.add_argument("--dim", type=int, default=None)
-    e.add_argument("--distance", default="Cosine")
-    e.add_argument("--recreate", action="store_true")
-
-    i = sub.add_parser("index")
-    i.add_argument("--collection", required=True)
-    i.add_argument("--directory", default="memory-bank")
-    i.add_argument("--idns", default="mem")
-    i.add_argument("--max-items", type=int, default=None)
-
-    q = sub.add_parser("query")
-    q.add_argument("--collection", required=True)
-    q.add_argument("--q", required=True)
-    q.add_argument("--k", type=int, default=5)
-    q.add_argument("--with-payload", action="store_true", default=True)
-    q.add_argument("--score-threshold", type=float, default=None)
-
-    d = sub.add_parser("delete")
-    d.add_argument("--collection", required=True)
-    d.add_argument("--ids", nargs="+", required=True)
-
-    ns = ap.parse_args(list(argv or []))
-    try:
-        if ns.cmd == "ensure":
-            print(json.dumps(vector_create_collection(ns.collection, ns.dim, ns.distance, ns.recreate), indent=2)); return 0
-        if ns.cmd == "index":
-            print(json.dumps(vector_index_memory_bank(ns.collection, ns.directory, ns.idns, ns.max_items), indent=2)); return 0
-        if ns.cmd == "query":
-            print(json.dumps(vector_query(ns.collection, ns.q, ns.k, ns.with_payload, ns.score_threshold), indent=2)); return 0
-        if ns.cmd == "delete":
-            print(json.dumps(vector_delete(ns.collection, ns.ids), indent=2)); return 0
-        print(json.dumps({"status":"error","error":f"Unknown cmd: {ns.cmd}"})); return 2
-    except Exception as ex:
-        print(json.dumps({"status":"error","error":f"{type(ex).__name__}: {ex}"})); return 3
-
-
-def _main_entry(argv: Optional[Sequence[str]] = None) -> int:
-    '''Internal helper that bridges ``main`` to ``run`` for reuse in tests.'''
-
-    return run(argv)
-
-
-def main():
-    '''Entrypoint for the generated MCP shim.
-
-    Returns:
-        int: Exit status propagated from ``run``.
-
-    Side Effects:
-        Reads arguments from ``sys.argv`` and exits via ``SystemExit`` upon completion.
-    '''
-
-    import sys
+def __getattr__(name: str) -> Any:
+    # The shim template lives in ._templates and is only imported when first needed.
+    if name == "_SHIM_CONTENT":
+        from ._templates import SHIM_CONTENT
 
-    return _main_entry(sys.argv[1:])
-
-if __name__ == "__main__":
-    raise SystemExit(main())
-"""
+        return SHIM_CONTENT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _generate_doc(primary_collection: str) -> str:
     """Generate VECTOR_MEMORY_MCP.md content describing env-based collection resolution and usage."""
-    extra = _list_additional_collections()
-    extras_line = ("\\n- " + "\\n- ".join(extra)) if extra else " (none configured)"
-    return f"""# Vector Memory MCP Usage
-
-This project initializes vector memory using environment-based collection resolution.
+    from ._templates import generate_doc
 
-Collections
-- Primary: {primary_collection}
-- Additional:{extras_line}
-
-Environment variables
-- MEMORY_COLLECTION_NAME: required. Primary collection name.
-- MEMORY_COLLECTION_NAME_2..N: optional additional collection names.
-- QDRANT_URL (default http://localhost:6333)
-- OLLAMA_URL (default http://localhost:11434)
-- EMBED_MODEL (default mxbai-embed-large)
-
-CLI
-- Ensure/create (uses probed embedding dimension):
-  vector-memory ensure-collection --name "$MEMORY_COLLECTION_NAME"
-- Remember (defaults to primary collection when --name omitted):
-  vector-memory remember --text "Atomic fact to remember"
-- Recall (defaults to primary collection when --name omitted):
-  vector-memory recall --q "question" --k 8 --with-payload
-
-MCP shim (CLI)
-- The file ./mcp_vector_memory.py exposes ensure, index, query, delete.
-- Agents can call it with the same env-based collection policy.
-
-Policy
-- If MEMORY_COLLECTION_NAME is not set (env or .env), commands that need a collection will fail and instruct you to set it.
-"""
+    return generate_doc(primary_collection, _list_additional_collections())
 
 
 def run(argv: Optional[Sequence[str]] = None) -> int:
     ap = build_parser()
     ns = ap.parse_args(list(argv or []))
 
-    emb = OllamaEmbeddingService()
-    store = QdrantVectorStore()
-
     try:
+        # Inside the try: the gRPC store raises when qdrant-client is missing, and that must
+        # be reported as JSON like any other failure.
+        emb = OllamaEmbeddingService()
+        store = make_vector_store()
         return dispatch_commands(ns, emb, store)
     except Exception as ex:  # keep CLI concise and user-friendly
-        print(json.dumps({"status": "error", "error": f"{type(ex).__name__}: {ex}"}))
+        _emit({"status": "error", "error": f"{type(ex).__name__}: {ex}"})
         return 3
 
 
@@ -320,26 +284,15 @@ def dispatch_commands(ns, emb, store):
     - index-memory-bank, remember, recall, query: default to MEMORY_COLLECTION_NAME if --name omitted
     - store-turn: persist a single chat turn (user/assistant) with deterministic IDs and metadata
     """
-    if ns.cmd == "new-project":
-        return new_project(emb, store)
+    handler = _HANDLERS.get(ns.cmd)
+    if handler is not None:
+        return handler(ns, emb, store)
 
-    if ns.cmd == "ensure-collection":
-        return _extracted_from_dispatch_commands_15(ns, emb, store)
-    if ns.cmd == "index-memory-bank":
-        return index_memory(ns, emb, store)
-
-    if ns.cmd == "remember":
-        return remember_memory(ns, emb, store)
+    _emit({"status": "error", "error": f"Unknown command: {ns.cmd}"})
+    return 2
 
-    if ns.cmd == "recall":
-        return _recall(ns, emb, store)
-    if ns.cmd == "query":
-        return _execute_command(ns, emb, store)
-    if ns.cmd == "store-turn":
-        return store_turn(ns, emb, store)
 
-    print(json.dumps({"status": "error", "error": f"Unknown command: {ns.cmd}"}))
-    return 2
+_QUERY_RESULT_FIELDS = operator.attrgetter("id", "score", "payload")
 
 
 def _serialize_query_result(result: object) -> Dict[str, Any]:
@@ -358,19 +311,32 @@ def _serialize_query_result(result: object) -> Dict[str, Any]:
         ValueError: Never raised directly; any errors originate from ``vars`` or payload serialization.
     """
 
-    try:
-        raw_attrs = dict(vars(result))
-    except TypeError:
-        raw_attrs = {}
+    if type(result) is QueryResult:
+        # Fast path for store results: read the known fields without materializing ``vars()``.
+        rid, score, payload = _QUERY_RESULT_FIELDS(result)
+        text_value = None
+    elif hasattr(type(result), "__slots__"):
+        # Slotted objects have no ``__dict__``; read the fields straight from their slots.
+        rid = getattr(result, "id", None)
+        score = getattr(result, "score", None)
+        payload = getattr(result, "payload", None)
+        text_value = getattr(result, "text", None)
+    else:
+        try:
+            raw_attrs = vars(result)
+        except TypeError:
+            raw_attrs = {}
+        rid = raw_attrs.get("id")
+        score = raw_attrs.get("score")
+        payload = raw_attrs.get("payload")
+        text_value = raw_attrs.get("text")
 
     data: Dict[str, Any] = {}
-    if "id" in raw_attrs and raw_attrs["id"] is not None:
-        data["id"] = raw_attrs["id"]
-    if "score" in raw_attrs and raw_attrs["score"] is not None:
-        data["score"] = float(raw_attrs["score"])
+    if rid is not None:
+        data["id"] = rid
+    if score is not None:
+        data["score"] = float(score)
 
-    payload = raw_attrs.get("payload")
-    text_value = raw_attrs.get("text")
     if isinstance(payload, dict):
         data["payload"] = payload
         if text_value is None:
@@ -384,55 +350,42 @@ def _serialize_query_result(result: object) -> Dict[str, Any]:
     return data
 
 
-def _execute_command(ns, emb, store):
-    """
-    Executes a query command against the specified Qdrant collection.
-
-    Checks if the collection exists, then performs a query using the provided parameters and prints the results.
+def _existing_collection(ns, store) -> Optional[str]:
+    """Resolve the target collection for ``ns`` and confirm it exists in Qdrant.
 
-    Args:
-        ns: Namespace object containing command-line arguments.
-        emb: Embedding service instance.
-        store: Vector store instance.
+    Shared preflight for query/recall/store-turn. A positive per-collection probe
+    (``store.collection_exists``) skips listing entirely; otherwise the listing is served
+    from the short-lived per-URL cache and also feeds the error payload.
 
     Returns:
-        int: 0 on success, 2 if the collection does not exist.
+        Optional[str]: The collection name, or ``None`` after emitting an error payload.
     """
     collection = _resolve_collection_name(getattr(ns, "name", None))
+    exists = None
+    with contextlib.suppress(Exception):
+        exists = store.collection_exists(collection)
+    if exists is True:
+        return collection
     available = _list_qdrant_collections()
-    if collection not in available:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "error": f"Collection '{collection}' does not exist in Qdrant.",
-                    "requested": collection,
-                    "available_collections": available,
-                },
-                indent=2,
-            )
-        )
-        return 2
-    results = QueryMemoryUseCase(emb, store).execute(
-        QueryRequest(
-            collection=collection,
-            query=str(ns.q),
-            k=int(ns.k),
-            with_payload=bool(ns.with_payload),
-            score_threshold=(float(ns.score_threshold) if getattr(ns, "score_threshold", None) is not None else None),
-        )
+    if collection in available:
+        return collection
+    _emit(
+        {
+            "status": "error",
+            "error": f"Collection '{collection}' does not exist in Qdrant.",
+            "requested": collection,
+            "available_collections": available,
+        },
+        indent=2,
     )
-    serialized = [_serialize_query_result(r) for r in results]
-    print(json.dumps({"status": "ok", "collection": collection, "result": serialized}, indent=2))
-    return 0
+    return None
 
 
-# TODO Rename this here and in `dispatch_commands`
-def _recall(ns, emb, store):
+def _query_like(ns, emb, store):
     """
-    Executes a recall command against the specified Qdrant collection.
+    Executes a recall/query command against the specified Qdrant collection.
 
-    Checks if the collection exists, then performs a recall query using the provided parameters and prints the results.
+    Both commands share this code path. Checks if the collection exists, then performs a query using the provided parameters and prints the results.
 
     Args:
         ns: Namespace object containing command-line arguments.
@@ -442,62 +395,45 @@ def _recall(ns, emb, store):
     Returns:
         int: 0 on success, 2 if the collection does not exist.
     """
-    collection = _resolve_collection_name(getattr(ns, "name", None))
-    available = _list_qdrant_collections()
-    if collection not in available:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "error": f"Collection '{collection}' does not exist in Qdrant.",
-                    "requested": collection,
-                    "available_collections": available,
-                },
-                indent=2,
-            )
-        )
+    collection = _existing_collection(ns, store)
+    if collection is None:
         return 2
     results = QueryMemoryUseCase(emb, store).execute(
         QueryRequest(
             collection=collection,
-            query=str(ns.q),
-            k=int(ns.k),
-            with_payload=bool(ns.with_payload),
-            score_threshold=(
-                float(ns.score_threshold)
-                if getattr(ns, "score_threshold", None) is not None
-                else None
-            ),
+            query=ns.q,
+            k=ns.k,
+            with_payload=ns.with_payload,
+            score_threshold=getattr(ns, "score_threshold", None),  # --score-threshold is type=float; query has none
         )
     )
     serialized = [_serialize_query_result(r) for r in results]
-    print(json.dumps({"status": "ok", "collection": collection, "result": serialized}, indent=2))
+    _emit({"status": "ok", "collection": collection, "result": serialized}, indent=2)
     return 0
 
 
-# TODO Rename this here and in `dispatch_commands`
-def _extracted_from_dispatch_commands_15(ns, emb, store):
-    target = str(ns.name).strip()
+def _handle_ensure(ns, emb, store):
+    """Ensure an env-declared collection exists (ensure-collection); rejects undeclared names."""
+    target = ns.name.strip()
     allowed = _allowed_collections()
     if target not in allowed:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "error": f"Collection '{target}' is not declared in environment (.env). "
-                             f"Add it as MEMORY_COLLECTION_NAME or MEMORY_COLLECTION_NAME_2..N before creation.",
-                    "requested": target,
-                    "allowed_env_collections": allowed,
-                    "available_collections": _list_qdrant_collections(),
-                },
-                indent=2,
-            )
+        _emit(
+            {
+                "status": "error",
+                "error": f"Collection '{target}' is not declared in environment (.env). "
+                         f"Add it as MEMORY_COLLECTION_NAME or MEMORY_COLLECTION_NAME_2..N before creation.",
+                "requested": target,
+                "allowed_env_collections": allowed,
+                "available_collections": _list_qdrant_collections(),
+            },
+            indent=2,
         )
         return 2
     EnsureCollectionUseCase(emb, store).execute(
-        EnsureCollectionRequest(collection=target, dim=ns.dim, distance=str(ns.distance), recreate=bool(ns.recreate))
+        EnsureCollectionRequest(collection=target, dim=ns.dim, distance=ns.distance, recreate=ns.recreate)
     )
-    print(json.dumps({"status": "ok", "collection": target}, indent=2))
+    _invalidate_collections_cache()
+    _emit({"status": "ok", "collection": target}, indent=2)
     return 0
 
 
@@ -510,16 +446,34 @@ def index_memory(ns, emb, store):
     root = Path(ns.dir)
     items = load_memory_items(root)
     if ns.max_items:
-        items = items[: int(ns.max_items)]
+        items = items[: ns.max_items]
+    from ..infrastructure.logging import get_logger  # deferred: only indexing logs, and logging is slow to import
+
+    logger = get_logger("vector_memory.cli")
     logger.info("Index request | collection=%s | dir=%s | candidates=%d", collection, root, len(items))
     resp = UpsertMemoryUseCase(emb, store).execute(
-        UpsertMemoryRequest(collection=collection, items=items, id_namespace=str(ns.idns))
+        UpsertMemoryRequest(collection=collection, items=items, id_namespace=ns.idns)
     )
     logger.info("Index completed | collection=%s | indexed=%d", collection, len(items))
-    print(json.dumps({"status": "ok", "collection": collection, "raw": resp.raw}, indent=2))
+    _emit({"status": "ok", "collection": collection, "raw": resp.raw}, indent=2)
     return 0
 
 
+def _iter_chunks(text: str, size: int) -> Iterator[str]:
+    """Lazily yield contiguous chunks of ``text``; same segmentation as :func:`_chunk`.
+
+    Text that fits in one chunk (the common case for chat turns) is yielded as-is without slicing.
+    """
+    step = max(1, size)
+    n = len(text)
+    if n <= step:
+        if n:
+            yield text
+        return
+    for i in range(0, n, step):
+        yield text[i : i + step]
+
+
 def _chunk(text: str, size: int) -> List[str]:
     """Split ``text`` into contiguous chunks honoring a minimum width of one character.
 
@@ -537,8 +491,18 @@ def _chunk(text: str, size: int) -> List[str]:
         ValueError: Never raised explicitly; the function relies on Python slicing semantics.
     """
 
+    return list(_iter_chunks(text, size))
+
+
+_REMEMBER_CONCURRENCY = 2
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield successive lists of at most ``size`` elements (minimum 1) from ``items``."""
+    it = iter(items)
     step = max(1, size)
-    return [text[i : i + step] for i in range(0, len(text), step)]
+    while batch := list(islice(it, step)):
+        yield batch
 
 
 def store_turn(ns, emb, store) -> int:
@@ -551,32 +515,25 @@ def store_turn(ns, emb, store) -> int:
       role: "user" | "assistant"
       text: str
     Optional:
-      name (collection), model, tool_calls (JSON string), files (list[str]), idns (namespace), chunk_chars
+      name (collection), model, tool_calls (JSON string), files (list[str]), idns (namespace), chunk_chars,
+      batch_size (chunks per upsert request; default MEMORY_EMBED_BATCH_SIZE)
     """
-    collection = _resolve_collection_name(getattr(ns, "name", None))
-    available = _list_qdrant_collections()
-    if collection not in available:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "error": f"Collection '{collection}' does not exist in Qdrant.",
-                    "requested": collection,
-                    "available_collections": available,
-                },
-                indent=2,
-            )
-        )
+    collection = _existing_collection(ns, store)
+    if collection is None:
         return 2
 
-    thread_id = str(ns.thread_id).strip()
-    turn_index = int(ns.turn_index)
-    role = str(ns.role).strip()
-    text = str(ns.text)
+    # argparse already typed these (--turn-index is type=int); no re-coercion needed.
+    thread_id = ns.thread_id.strip()
+    turn_index = ns.turn_index
+    role = ns.role.strip()
+    text = ns.text
     model = getattr(ns, "model", None)
     files = list(getattr(ns, "files", []) or [])
-    idns = str(getattr(ns, "idns", "chat"))
-    chunk_size = int(getattr(ns, "chunk_chars", 0) or 0) or chat_chunk_chars()
+    idns = getattr(ns, "idns", "chat")
+    chunk_size = getattr(ns, "chunk_chars", None) or chat_chunk_chars()
+    batch_size = getattr(ns, "batch_size", None) or embed_batch_size()
+    from datetime import datetime, timezone  # only store-turn needs timestamps
+
     ts = datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z"
     message_id = f"{thread_id}:{turn_index}"
 
@@ -585,44 +542,44 @@ def store_turn(ns, emb, store) -> int:
     raw_tool_calls = getattr(ns, "tool_calls", None)
     if raw_tool_calls:
         with contextlib.suppress(Exception):
-            tool_calls = json.loads(raw_tool_calls)
-
-    from ..domain.models import MemoryItem  # local import to avoid circulars at top
-
-    chunks = _chunk(text, chunk_size)
-    items: List[MemoryItem] = []
-    for i, part in enumerate(chunks):
-        meta = {
-            "kind": "chat",
-            "thread_id": thread_id,
-            "turn_index": turn_index,
-            "role": role,
-            "ts": ts,
+            tool_calls = _loads(raw_tool_calls)
+
+    # Turn-level fields are identical for every chunk; optional ones are only added when set.
+    base_meta: Dict[str, Any] = {
+        "kind": "chat",
+        "thread_id": thread_id,
+        "turn_index": turn_index,
+        "role": role,
+        "ts": ts,
+        "message_id": message_id,
+    }
+    if tool_calls is not None:
+        base_meta["tool_calls"] = tool_calls
+    base_meta["files_touched"] = files
+    if role == "assistant" and model:
+        base_meta["model"] = model
+    source_prefix = f"chat:{thread_id}:{turn_index}:{role}:"
+
+    def _items() -> Iterator[MemoryItem]:
+        for i, part in enumerate(_iter_chunks(text, chunk_size)):
+            yield MemoryItem(text=part, meta=base_meta | {"chunk_index": i, "source": f"{source_prefix}{i}"})
+
+    # Upsert in fixed-size sub-batches so long turns never hold every chunk (and vector) at once.
+    use_case = UpsertMemoryUseCase(emb, store)
+    indexed = 0
+    raw: Any = None
+    for batch in _batched(_items(), batch_size):
+        raw = use_case.execute(UpsertMemoryRequest(collection=collection, items=batch, id_namespace=idns)).raw
+        indexed += len(batch)
+    _emit(
+        {
+            "status": "ok",
+            "collection": collection,
+            "indexed_chunks": indexed,
             "message_id": message_id,
-            "chunk_index": i,
-            "tool_calls": tool_calls,
-            "files_touched": files,
-            "model": model if role == "assistant" and model else None,
-            "source": f"chat:{thread_id}:{turn_index}:{role}:{i}",
-        }
-        # Remove None values for compact payload
-        meta = {k: v for k, v in meta.items() if v is not None}
-        items.append(MemoryItem(text=part, meta=meta))
-
-    resp = UpsertMemoryUseCase(emb, store).execute(
-        UpsertMemoryRequest(collection=collection, items=items, id_namespace=idns)
-    )
-    print(
-        json.dumps(
-            {
-                "status": "ok",
-                "collection": collection,
-                "indexed_chunks": len(items),
-                "message_id": message_id,
-                "raw": resp.raw,
-            },
-            indent=2,
-        )
+            "raw": raw,
+        },
+        indent=2,
     )
     return 0
 
@@ -636,18 +593,21 @@ def new_project(emb, store) -> int:
     """
     name = _env_get("MEMORY_COLLECTION_NAME")
     if not name:
-        print(json.dumps({"status": "error", "error": "MEMORY_COLLECTION_NAME is not set in environment or .env"}, indent=2))
+        _emit({"status": "error", "error": "MEMORY_COLLECTION_NAME is not set in environment or .env"}, indent=2)
         return 2
 
     dim = emb.get_dimension()
     EnsureCollectionUseCase(emb, store).execute(
         EnsureCollectionRequest(collection=name, dim=dim, distance="Cosine", recreate=False)
     )
+    _invalidate_collections_cache()
 
     cwd = Path(".").resolve()
     shim_path = cwd / "mcp_vector_memory.py"
     doc_path = cwd / "VECTOR_MEMORY_MCP.md"
-    created_shim = _write_file_if_missing(shim_path, _SHIM_CONTENT)
+    from ._templates import SHIM_CONTENT
+
+    created_shim = _write_file_if_missing(shim_path, SHIM_CONTENT)
     created_doc = _write_file_if_missing(doc_path, _generate_doc(name))
 
     # best-effort chmod +x for shim
@@ -655,24 +615,21 @@ def new_project(emb, store) -> int:
         if created_shim:
             mode = shim_path.stat().st_mode
             shim_path.chmod(mode | 0o111)
-    print(
-        json.dumps(
-            {
-                "status": "ok",
-                "collection": name,
-                "dimension": dim,
-                "mcp_shim_created": created_shim,
-                "doc_created": created_doc,
-                "additional_collections": _list_additional_collections(),
-            },
-            indent=2,
-        )
+    _emit(
+        {
+            "status": "ok",
+            "collection": name,
+            "dimension": dim,
+            "mcp_shim_created": created_shim,
+            "doc_created": created_doc,
+            "additional_collections": _list_additional_collections(),
+        },
+        indent=2,
     )
     return 0
 
 
 def main() -> int:
-    import sys
     return run(sys.argv[1:])
 
 
@@ -685,23 +642,16 @@ def remember_memory(ns, emb, store):
     """
     collection = _resolve_collection_name(getattr(ns, "name", None))
 
-    texts: List[str] = []
-    for t in (ns.text or []):
-        t = str(t).strip()
-        if t:
-            texts.append(t)
-
-    if getattr(ns, "file", None):
-        p = Path(ns.file)
-        if p.exists():
-            for line in p.read_text(encoding="utf-8", errors="ignore").splitlines():
-                line = line.strip()
-                if line:
-                    texts.append(line)
-
-    if not texts:
-        print(json.dumps({"status": "ok", "collection": collection, "result": {"indexed": 0}}))
-        return 0
+    def _texts() -> Iterator[str]:
+        for t in (ns.text or []):
+            t = t.strip()
+            if t:
+                yield t
+        if getattr(ns, "file", None):
+            # Open directly (a missing file is silently skipped) instead of a separate exists() stat,
+            # and stream line by line so a large file is never resident as one string or line list.
+            with contextlib.suppress(FileNotFoundError), open(ns.file, encoding="utf-8", errors="ignore") as fh:
+                yield from (s for s in (line.strip() for line in fh) if s)
 
     tags = list(ns.tag or [])
     meta_common = {
@@ -710,13 +660,67 @@ def remember_memory(ns, emb, store):
         "source": "cli:remember",
     }
 
-    items = [MemoryItem(text=t, meta=meta_common) for t in texts]
-    resp = UpsertMemoryUseCase(emb, store).execute(
-        UpsertMemoryRequest(collection=collection, items=items, id_namespace=str(ns.idns))
-    )
-    print(json.dumps({"status": "ok", "collection": collection, "indexed": len(items), "raw": resp.raw}, indent=2))
+    # Items are produced and batched lazily; at most ``workers`` batches are resident at once.
+    batches = _batched((MemoryItem(text=t, meta=meta_common) for t in _texts()), embed_batch_size())
+    first = next(batches, None)
+    if first is None:
+        _emit({"status": "ok", "collection": collection, "result": {"indexed": 0}})
+        return 0
+    second = next(batches, None)
+    workers = 1 if second is None else min(getattr(ns, "concurrency", None) or _REMEMBER_CONCURRENCY, HTTP_POOL_SIZE)
+    batches = chain((first,) if second is None else (first, second), batches)
+
+    use_case = UpsertMemoryUseCase(emb, store)
+
+    def _upsert(batch: List[MemoryItem]) -> Any:
+        return use_case.execute(UpsertMemoryRequest(collection=collection, items=batch, id_namespace=ns.idns)).raw
+
+    # Every batch must succeed (errors propagate), so ``raw`` is reported in a single upsert's shape:
+    # the last batch's response with ``time`` summed over all batches, as the Qdrant adapter does.
+    raw: Any = None
+    indexed, total_time = 0, 0.0
+
+    def _collect(resp: Any, n: int) -> None:
+        nonlocal raw, indexed, total_time
+        raw, indexed = resp, indexed + n
+        total_time += float((resp or {}).get("time") or 0.0)
+
+    if workers <= 1:
+        for batch in batches:
+            _collect(_upsert(batch), len(batch))
+    else:
+        # Sub-batch embed+upsert round trips overlap on a few threads (I/O bound); workers are
+        # capped at the HTTP pool size so connections are never queued.
+        from concurrent.futures import ThreadPoolExecutor
+
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for batch in batches:
+                pending.append((ex.submit(_upsert, batch), len(batch)))
+                if len(pending) < workers:
+                    continue
+                fut, n = pending.popleft()
+                _collect(fut.result(), n)
+            for fut, n in pending:
+                _collect(fut.result(), n)
+    if second is not None:
+        raw = {**(raw or {}), "time": total_time}
+    _emit({"status": "ok", "collection": collection, "indexed": indexed, "raw": raw}, indent=2)
     return 0
 
 
+# Command name -> handler(ns, emb, store); built once at import for O(1) dispatch.
+# new-project resolves its target at call time so tests can patch the module attribute.
+_HANDLERS = {
+    "new-project": lambda ns, emb, store: new_project(emb, store),
+    "ensure-collection": _handle_ensure,
+    "index-memory-bank": index_memory,
+    "remember": remember_memory,
+    "recall": _query_like,
+    "query": _query_like,
+    "store-turn": store_turn,
+}
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
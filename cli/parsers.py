@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import argparse
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
+    """Return the CLI parser; built once per process since ``parse_args`` does not mutate it."""
     ap = argparse.ArgumentParser(description="Vector memory (Ollama + Qdrant)")
     # Allow either a subcommand or a top-level --new-project flag
     ap.add_argument(
@@ -38,6 +41,7 @@ def build_parser() -> argparse.ArgumentParser:
     rm.add_argument("--file", help="Path to a file; each non-empty line becomes a memory")
     rm.add_argument("--tag", action="append", default=[], help="Tag label to add to memory payload; can repeat")
     rm.add_argument("--idns", default="convo", help="ID namespace for deterministic UUIDv5")
+    rm.add_argument("--concurrency", type=int, default=2, help="Parallel embed/upsert batches (default 2, max 16)")
 
     # Store a chat turn (user/assistant) with metadata and chunking
     st = sub.add_parser("store-turn")
@@ -51,6 +55,7 @@ def build_parser() -> argparse.ArgumentParser:
     st.add_argument("--files", action="append", default=[], help="Relative file paths touched; can repeat")
     st.add_argument("--idns", default="chat", help="ID namespace for deterministic UUIDv5")
     st.add_argument("--chunk-chars", type=int, default=None, help="Override chunk size (defaults to env MEMORY_CHAT_CHUNK_CHARS or 4000)")
+    st.add_argument("--batch-size", type=int, default=64, help="Chunks per embed/upsert request (default 64)")
 
     rc = add_subparser(sub, "recall")
     rc.add_argument("--score-threshold", type=float, default=None)
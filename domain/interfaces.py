@@ -47,3 +47,15 @@ class VectorStore(ABC):
     ) -> List[QueryResult]:
         """Search similar points; returns list of QueryResult."""
         raise NotImplementedError
+
+    def collection_exists(self, name: str) -> Optional[bool]:
+        """Cheap existence probe; ``None`` means unknown and callers should fall back to listing."""
+        return None
+
+    def set_bulk_load(self, name: str, enabled: bool) -> None:
+        """Pause (``True``) or restore (``False``) index building around a large ingest.
+
+        Optional tuning hint: the default does nothing, so stores without an equivalent
+        still ingest correctly, only without the bulk-load speedup.
+        """
+        return None
@@ -10,7 +10,8 @@ class MemoryItem:
 
     Fields:
         text: Raw content to embed (full text; callers may trim into payload).
-        meta: Arbitrary metadata (e.g., source path, filename, mtime).
+        meta: Arbitrary metadata (e.g., source path, filename, mtime). Batches may share one
+            dict across items, so treat it as read-only once the item is built.
     """
     text: str
     meta: Dict[str, object]
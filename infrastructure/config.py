@@ -1,24 +1,43 @@
 from __future__ import annotations
 
 import os
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+# One KEY=VALUE assignment per line; blank lines, '#' comments and lines without a key never match.
+_KV_LINE_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+
+
+def parse_kv_text(text: str) -> Dict[str, str]:
+    """Parse KEY=VALUE text (.env files, the watcher lock file); surrounding quotes are stripped."""
+    return {k: v.strip('"').strip("'") for k, v in _KV_LINE_RE.findall(text)}
+
+
+# The zero-argument getters below read the environment once per process (they sit on
+# per-request paths); call clear_cache() after changing the environment at runtime.
 
 
 def env_str(name: str, default: str) -> str:
     return os.getenv(name, default).strip() or default
 
 
+@lru_cache(maxsize=None)
 def qdrant_url() -> str:
     return env_str("QDRANT_URL", "http://localhost:6333").rstrip("/")
 
 
+@lru_cache(maxsize=None)
 def ollama_url() -> str:
     return env_str("OLLAMA_URL", "http://localhost:11434").rstrip("/")
 
 
+@lru_cache(maxsize=None)
 def embed_model() -> str:
     return env_str("EMBED_MODEL", "mxbai-embed-large")
 
 
+@lru_cache(maxsize=None)
 def payload_text_max() -> int:
     try:
         return int(env_str("MEMORY_PAYLOAD_TEXT_MAX", "4096"))
@@ -26,6 +45,109 @@ def payload_text_max() -> int:
         return 4096
 
 
+@lru_cache(maxsize=None)
+def embed_cache_size() -> int:
+    """
+    Maximum number of embedding vectors kept in the process-local content-hash cache.
+    Defaults to 1024 when EMBED_CACHE_SIZE is not set or invalid; 0 disables the cache.
+    """
+    try:
+        return max(0, int(env_str("EMBED_CACHE_SIZE", "1024")))
+    except Exception:
+        return 1024
+
+
+@lru_cache(maxsize=None)
+def embed_batch_size() -> int:
+    """
+    Maximum number of texts sent to Ollama in one /api/embed request.
+    Defaults to 64 when MEMORY_EMBED_BATCH_SIZE is not set, invalid or < 1.
+    """
+    try:
+        return max(1, int(env_str("MEMORY_EMBED_BATCH_SIZE", "64")))
+    except Exception:
+        return 64
+
+
+@lru_cache(maxsize=None)
+def upsert_batch_size() -> int:
+    """
+    Maximum number of points sent to Qdrant in one upsert request.
+    Defaults to 256 when MEMORY_UPSERT_BATCH_SIZE is not set, invalid or < 1.
+    """
+    try:
+        return max(1, int(env_str("MEMORY_UPSERT_BATCH_SIZE", "256")))
+    except Exception:
+        return 256
+
+
+@lru_cache(maxsize=None)
+def upsert_concurrency() -> int:
+    """
+    Number of upsert batches sent to Qdrant in parallel.
+    Defaults to 4 when MEMORY_UPSERT_CONCURRENCY is not set, invalid or < 1.
+    """
+    try:
+        return max(1, int(env_str("MEMORY_UPSERT_CONCURRENCY", "4")))
+    except Exception:
+        return 4
+
+
+@lru_cache(maxsize=None)
+def delete_batch_size() -> int:
+    """
+    Maximum number of point IDs sent to Qdrant in one delete request.
+    Defaults to 1000 when MEMORY_DELETE_BATCH_SIZE is not set, invalid or < 1.
+    """
+    try:
+        return max(1, int(env_str("MEMORY_DELETE_BATCH_SIZE", "1000")))
+    except Exception:
+        return 1000
+
+
+@lru_cache(maxsize=None)
+def vector_quantization() -> Optional[str]:
+    """
+    Server-side vector quantization applied to newly created collections.
+    MEMORY_QUANTIZE=int8 enables Qdrant scalar int8 quantization; unset or any other value disables it.
+    """
+    mode = env_str("MEMORY_QUANTIZE", "").lower()
+    return mode if mode == "int8" else None
+
+
+@lru_cache(maxsize=None)
+def qdrant_transport() -> str:
+    """
+    Wire protocol used to reach Qdrant: "rest" (default, HTTP/JSON) or "grpc".
+    MEMORY_QDRANT_TRANSPORT=grpc needs the optional qdrant-client package; any other value means REST.
+    """
+    mode = env_str("MEMORY_QDRANT_TRANSPORT", "rest").lower()
+    return "grpc" if mode == "grpc" else "rest"
+
+
+@lru_cache(maxsize=None)
+def qdrant_grpc_port() -> int:
+    """gRPC port of the Qdrant server; defaults to 6334 when QDRANT_GRPC_PORT is not set or invalid."""
+    try:
+        return int(env_str("QDRANT_GRPC_PORT", "6334"))
+    except Exception:
+        return 6334
+
+
+@lru_cache(maxsize=None)
+def semcache_threshold() -> Optional[float]:
+    """
+    Cosine similarity above which an MCP query reuses the results of an earlier, near-identical query.
+    Disabled (None) unless MEMORY_SEMCACHE_THRESHOLD is set to a value in (0, 1].
+    """
+    try:
+        value = float(env_str("MEMORY_SEMCACHE_THRESHOLD", "0"))
+    except Exception:
+        return None
+    return value if 0.0 < value <= 1.0 else None
+
+
+@lru_cache(maxsize=None)
 def chat_chunk_chars() -> int:
     """
     Chunk size for splitting chat messages into contiguous pieces before embedding.
@@ -35,3 +157,24 @@ def chat_chunk_chars() -> int:
         return int(env_str("MEMORY_CHAT_CHUNK_CHARS", "4000"))
     except Exception:
         return 4000
+
+
+def clear_cache() -> None:
+    """Forget memoized settings so the next call re-reads the environment."""
+    for fn in (
+        qdrant_url,
+        ollama_url,
+        embed_model,
+        payload_text_max,
+        embed_cache_size,
+        embed_batch_size,
+        upsert_batch_size,
+        upsert_concurrency,
+        delete_batch_size,
+        vector_quantization,
+        qdrant_transport,
+        qdrant_grpc_port,
+        semcache_threshold,
+        chat_chunk_chars,
+    ):
+        fn.cache_clear()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+from contextlib import suppress
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+try:  # optional C-accelerated JSON for large request/response bodies; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+
+# Connections kept per host; callers fanning out requests should not exceed it.
+HTTP_POOL_SIZE = 16
+
+
+@lru_cache(maxsize=1)
+def http_session() -> "requests.Session":
+    """
+    Process-wide ``requests.Session`` with a keep-alive connection pool.
+
+    Repeated calls in one process (e.g. several recall/query/store-turn preflights) reuse
+    pooled TCP connections instead of reconnecting per request. Connection errors on
+    idempotent methods are retried twice with a short backoff; HTTP status codes are not.
+    ``requests`` is imported on first use to keep CLI startup light.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=()),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def encode_json(obj: Any) -> bytes:
+    """Serialize a request body (pass as ``data=`` with ``JSON_HEADERS``), using orjson when available."""
+    if orjson is not None:
+        with suppress(TypeError):  # e.g. non-str dict keys; let stdlib handle or report them
+            return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(response: "requests.Response") -> Any:
+    """Parse a response body, using orjson when available; an empty body decodes to ``None``."""
+    content = response.content
+    if not content:
+        return None
+    return orjson.loads(content) if orjson is not None else json.loads(content)
@@ -1,35 +1,89 @@
 from __future__ import annotations
 
-from typing import List
-import requests
+from typing import Dict, List, Tuple
 
 from ...domain.interfaces import EmbeddingService
 from ...domain.models import Vector
 from ..timeouts import http_timeout_seconds, operation_timeout
-from ..config import ollama_url, embed_model
+from ..config import ollama_url, embed_model, embed_batch_size
+from ..http import decode_json, http_session
+
+# Batched requests embed many texts per call; never give them less than this many seconds.
+_BATCH_TIMEOUT_FLOOR_S = 60.0
+
+# Embedding dimension per (ollama_url, model), learned from any successful embed in this process.
+_DIM_CACHE: Dict[Tuple[str, str], int] = {}
+
+
+def _is_ollama_error(response) -> bool:
+    """True for Ollama's own JSON error body (e.g. ``{"error": "model ... not found"}``).
+
+    A server that predates /api/embed answers its 404 with a plain-text "404 page not found" instead.
+    """
+    try:
+        body = decode_json(response)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(body, dict) and "error" in body
 
 
 class OllamaEmbeddingService(EmbeddingService):
-    """Embedding adapter for Ollama /api/embeddings."""
+    """Embedding adapter for Ollama /api/embed (batched input)."""
 
     def embed_texts(self, texts: List[str]) -> List[Vector]:
+        """Embed ``texts`` via ``/api/embed`` in batches of ``MEMORY_EMBED_BATCH_SIZE``.
+
+        Servers without the batch endpoint (a plain 404, or a response lacking ``embeddings``)
+        are served one text at a time through the legacy ``/api/embeddings`` endpoint. Ollama's
+        JSON 404 for an unknown model is raised as-is.
+
+        Raises:
+            requests.HTTPError: On non-2xx provider responses.
+            KeyError: When a legacy response lacks the ``embedding`` array.
+        """
         if not texts:
             return []
+        session = http_session()
         base = ollama_url()
-        url = f"{base}/api/embeddings"
-        timeout = http_timeout_seconds()
+        url = f"{base}/api/embed"
+        timeout = max(http_timeout_seconds(), _BATCH_TIMEOUT_FLOOR_S)
         model = embed_model()
+        step = embed_batch_size()
         out: List[Vector] = []
-        with operation_timeout(timeout):
-            for t in texts:
-                r = requests.post(url, json={"model": model, "prompt": t}, timeout=timeout)
-                r.raise_for_status()
-                data = r.json()
-                values = [float(x) for x in data["embedding"]]
-                out.append(Vector(values=values, dim=len(values)))
+        for start in range(0, len(texts), step):
+            batch = list(texts[start:start + step])
+            with operation_timeout(timeout):
+                r = session.post(url, json={"model": model, "input": batch}, timeout=timeout)
+                if r.status_code == 404 and not _is_ollama_error(r):
+                    rows = None
+                else:
+                    r.raise_for_status()
+                    rows = (decode_json(r) or {}).get("embeddings")
+            if rows is None:
+                rows = self._embed_legacy(batch, base, model, timeout)
+            # Decoded rows are fresh lists of floats; wrap them as-is rather than re-boxing every component.
+            out.extend(Vector(values=row, dim=len(row)) for row in rows)
+        if out:
+            _DIM_CACHE[(base, model)] = out[0].dim
         return out
 
+    @staticmethod
+    def _embed_legacy(texts: List[str], base: str, model: str, timeout: float) -> List[List[float]]:
+        """Embed one text per request through the pre-0.2 ``/api/embeddings`` endpoint."""
+        session = http_session()
+        rows: List[List[float]] = []
+        for t in texts:
+            with operation_timeout(timeout):
+                r = session.post(f"{base}/api/embeddings", json={"model": model, "prompt": t}, timeout=timeout)
+                r.raise_for_status()
+                rows.append(r.json()["embedding"])
+        return rows
+
     def get_dimension(self) -> int:
+        """Return the model's embedding dimension, probing Ollama only if no embed has reported it yet."""
+        dim = _DIM_CACHE.get((ollama_url(), embed_model()))
+        if dim is not None:
+            return dim
         vecs = self.embed_texts(["probe"])
         if not vecs:
             raise RuntimeError("Embedding dimension probe failed (no vectors)")
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
 from pathlib import Path
-import requests
 
 from ...domain.interfaces import VectorStore
 from ...domain.models import Vector, Point, QueryResult
 from ..timeouts import http_timeout_seconds, operation_timeout
-from ..config import qdrant_url
+from ..config import parse_kv_text, qdrant_url, upsert_batch_size, upsert_concurrency, vector_quantization
+from ..http import HTTP_POOL_SIZE, JSON_HEADERS, decode_json, encode_json, http_session
+from ..ttl_cache import TTLCache
 from contextlib import suppress
 
 
@@ -17,20 +18,18 @@ def _parse_shell_kv_file(path: Path) -> dict:
     Minimal KEY=VALUE parser for the watcher lock file.
     Ignores comments and blank lines; strips single/double quotes around values.
     """
-    data: dict = {}
     try:
-        for raw in path.read_text(encoding="utf-8", errors="ignore").splitlines():
-            s = raw.strip()
-            if not s or s.startswith("#") or "=" not in s:
-                continue
-            k, v = s.split("=", 1)
-            k = k.strip()
-            v = v.strip().strip('"').strip("'")
-            if k:
-                data[k] = v
+        text = path.read_text(encoding="utf-8", errors="ignore")
     except Exception:
         return {}
-    return data
+    return parse_kv_text(text)
+
+
+# vector_memory/tools/current_thread.lock, resolved once (this file is .../infrastructure/qdrant/client.py).
+_DEFAULT_LOCK_FILE = Path(__file__).resolve().parent.parent.parent / "tools" / "current_thread.lock"
+
+# Parsed THREAD_ID per lock path, keyed by (st_mtime_ns, st_size); searches only re-read a changed lock file.
+_LOCK_CACHE: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
 
 
 def _load_thread_id_from_lock() -> Optional[str]:
@@ -47,34 +46,58 @@ def _load_thread_id_from_lock() -> Optional[str]:
         return None
 
     lock_env = os.getenv("VM_THREAD_LOCK_FILE") or os.getenv("LOCK_FILE")
-    if lock_env:
-        p = Path(lock_env).expanduser()
-    else:
-        here = Path(__file__).resolve()
-        # .../vector_memory/infrastructure/qdrant/client.py -> vector_memory
-        vm_root = here.parent.parent.parent
-        p = vm_root / "tools" / "current_thread.lock"
-
-    if not p.exists():
+    p = Path(lock_env).expanduser() if lock_env else _DEFAULT_LOCK_FILE
+
+    try:
+        st = p.stat()
+    except OSError:
         return None
+    key = str(p)
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _LOCK_CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
 
     kv = _parse_shell_kv_file(p)
     tid = kv.get("THREAD_ID")
-    return tid.strip() if isinstance(tid, str) and tid.strip() else None
+    tid = tid.strip() if isinstance(tid, str) and tid.strip() else None
+    _LOCK_CACHE[key] = (sig, tid)
+    return tid
+
+
+# {name, dim} listing per Qdrant base URL; the UI re-reads it on every refresh.
+_INFO_CACHE: TTLCache[List[dict]] = TTLCache(5.0)
+
+
+# Qdrant's bulk-upload recipe: no HNSW graph (m=0) and no optimizer indexing while loading,
+# then the stock m=16 / indexing_threshold=20000 once the data is in.
+_BULK_LOAD_TUNING = {"m": 0, "indexing_threshold": 0}
+_INDEXED_TUNING = {"m": 16, "indexing_threshold": 20000}
+
+
+def _collection_config(dim: int, distance: str) -> dict:
+    """Create-collection body; adds scalar int8 quantization when MEMORY_QUANTIZE=int8."""
+    body: dict = {"vectors": {"size": dim, "distance": distance}}
+    if vector_quantization() == "int8":
+        # Qdrant keeps the original float vectors for rescoring; the int8 copy serves the search itself.
+        body["quantization_config"] = {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}}
+    return body
 
 
 class QdrantVectorStore(VectorStore):
     """Vector store adapter for Qdrant REST."""
 
     def ensure_collection(self, name: str, dim: int, distance: str = "Cosine", recreate: bool = False) -> None:
+        session = http_session()
         timeout = http_timeout_seconds()
         base = qdrant_url()
         # Get collection
         with operation_timeout(timeout):
-            r = requests.get(f"{base}/collections/{name}", timeout=timeout)
+            r = session.get(f"{base}/collections/{name}", timeout=timeout)
             if r.status_code == 404:
-                r2 = requests.put(f"{base}/collections/{name}", json={"vectors": {"size": dim, "distance": distance}}, timeout=timeout)
+                r2 = session.put(f"{base}/collections/{name}", json=_collection_config(dim, distance), timeout=timeout)
                 r2.raise_for_status()
+                _INFO_CACHE.pop(base)
                 return
             r.raise_for_status()
             data = r.json()
@@ -86,24 +109,45 @@ class QdrantVectorStore(VectorStore):
             if not recreate:
                 raise ValueError(f"Collection {name} has size={existing}, expected={dim}")
             with operation_timeout(timeout):
-                dr = requests.delete(f"{base}/collections/{name}", timeout=timeout)
+                dr = session.delete(f"{base}/collections/{name}", timeout=timeout)
                 dr.raise_for_status()
-                cr = requests.put(f"{base}/collections/{name}", json={"vectors": {"size": dim, "distance": distance}}, timeout=timeout)
+                cr = session.put(f"{base}/collections/{name}", json=_collection_config(dim, distance), timeout=timeout)
                 cr.raise_for_status()
+            _INFO_CACHE.pop(base)
 
     def upsert_points(self, name: str, points: List[Point]) -> dict:
+        """Upsert ``points`` in batches of ``MEMORY_UPSERT_BATCH_SIZE``.
+
+        Multiple batches are sent concurrently (``MEMORY_UPSERT_CONCURRENCY`` workers, capped at
+        the HTTP pool size). Every batch waits for Qdrant to apply it, so the call returns only
+        once all points are stored; the last batch's response is returned with ``time`` summed.
+
+        Raises:
+            requests.HTTPError: When any batch is rejected.
+        """
+        session = http_session()
         timeout = http_timeout_seconds()
-        base = qdrant_url()
-        body = {
-            "points": [
-                {"id": p.id, "vector": p.vector.values, "payload": p.payload}
-                for p in points
-            ]
-        }
-        with operation_timeout(timeout):
-            r = requests.put(f"{base}/collections/{name}/points?wait=true", json=body, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
+        url = f"{qdrant_url()}/collections/{name}/points?wait=true"
+
+        def _put(batch: List[Point]) -> dict:
+            body = {"points": [{"id": p.id, "vector": p.vector.values, "payload": p.payload} for p in batch]}
+            with operation_timeout(timeout):
+                r = session.put(url, data=encode_json(body), headers=JSON_HEADERS, timeout=timeout)
+                r.raise_for_status()
+                return decode_json(r)
+
+        step = upsert_batch_size()
+        if len(points) <= step:
+            return _put(points)
+        from concurrent.futures import ThreadPoolExecutor  # deferred: only multi-batch upserts need threads
+
+        batches = [points[i:i + step] for i in range(0, len(points), step)]
+        workers = min(upsert_concurrency(), HTTP_POOL_SIZE, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            responses = list(ex.map(_put, batches))
+        out = dict(responses[-1] or {})
+        out["time"] = sum(float((resp or {}).get("time") or 0.0) for resp in responses)
+        return out
 
     def search(
         self,
@@ -113,6 +157,7 @@ class QdrantVectorStore(VectorStore):
         with_payload: bool = True,
         score_threshold: Optional[float] = None,
     ) -> List[QueryResult]:
+        session = http_session()
         timeout = http_timeout_seconds()
         base = qdrant_url()
         body = {
@@ -131,9 +176,11 @@ class QdrantVectorStore(VectorStore):
             body["filter"] = {"must": [{"key": "meta.thread_id", "match": {"value": tid}}]}
 
         with operation_timeout(timeout):
-            r = requests.post(f"{base}/collections/{name}/points/search", json=body, timeout=timeout)
+            r = session.post(
+                f"{base}/collections/{name}/points/search", data=encode_json(body), headers=JSON_HEADERS, timeout=timeout
+            )
             r.raise_for_status()
-            data = r.json() or {}
+            data = decode_json(r) or {}
             results: List[QueryResult] = []
             for it in (data.get("result") or []):
                 results.append(
@@ -145,13 +192,41 @@ class QdrantVectorStore(VectorStore):
                 )
             return results
 
+    def collection_exists(self, name: str) -> Optional[bool]:
+        """Check one collection via ``GET /collections/{name}/exists`` (Qdrant >= 1.8).
+
+        Returns ``None`` when the server does not expose the endpoint so callers can list instead.
+        """
+        session = http_session()
+        timeout = http_timeout_seconds()
+        base = qdrant_url()
+        with operation_timeout(timeout):
+            r = session.get(f"{base}/collections/{name}/exists", timeout=timeout)
+            if r.status_code == 404:
+                return None
+            r.raise_for_status()
+            data = r.json() or {}
+        exists = (data.get("result") or {}).get("exists")
+        return exists if isinstance(exists, bool) else None
+
+    def set_bulk_load(self, name: str, enabled: bool) -> None:
+        """Toggle bulk-load tuning via ``PATCH /collections/{name}``."""
+        tuning = _BULK_LOAD_TUNING if enabled else _INDEXED_TUNING
+        body = {"hnsw_config": {"m": tuning["m"]}, "optimizers_config": {"indexing_threshold": tuning["indexing_threshold"]}}
+        session = http_session()
+        timeout = http_timeout_seconds()
+        with operation_timeout(timeout):
+            r = session.patch(f"{qdrant_url()}/collections/{name}", json=body, timeout=timeout)
+            r.raise_for_status()
+
     # --- Listing helpers for UI ---
     def list_collections(self) -> List[str]:
         """List collection names present in Qdrant."""
+        session = http_session()
         timeout = http_timeout_seconds()
         base = qdrant_url()
         with operation_timeout(timeout):
-            r = requests.get(f"{base}/collections", timeout=timeout)
+            r = session.get(f"{base}/collections", timeout=timeout)
             r.raise_for_status()
             data = r.json() or {}
         cols = []
@@ -161,12 +236,26 @@ class QdrantVectorStore(VectorStore):
                 cols.append(name)
         return cols
 
+    def points_count(self, name: str) -> Optional[int]:
+        """Return the number of points in a collection, or ``None`` when it does not exist or is unknown."""
+        session = http_session()
+        timeout = http_timeout_seconds()
+        with operation_timeout(timeout):
+            r = session.get(f"{qdrant_url()}/collections/{name}", timeout=timeout)
+            if r.status_code == 404:
+                return None
+            r.raise_for_status()
+            data = decode_json(r) or {}
+        count = (data.get("result") or {}).get("points_count")
+        return count if isinstance(count, int) else None
+
     def get_collection_dim(self, name: str) -> Optional[int]:
         """Return the embedding dimension for a collection, if determinable."""
+        session = http_session()
         timeout = http_timeout_seconds()
         base = qdrant_url()
         with operation_timeout(timeout):
-            r = requests.get(f"{base}/collections/{name}", timeout=timeout)
+            r = session.get(f"{base}/collections/{name}", timeout=timeout)
             if r.status_code == 404:
                 return None
             r.raise_for_status()
@@ -189,14 +278,30 @@ class QdrantVectorStore(VectorStore):
         return None
 
     def list_collections_info(self) -> List[dict]:
-        """Return list of {name, dim} for Qdrant collections."""
-        names = self.list_collections()
-        out: List[dict] = []
-        for n in names:
-            dim = None
+        """Return list of {name, dim} for Qdrant collections.
+
+        Per-collection lookups run in parallel over the pooled session, and the listing is
+        reused for a few seconds (dropped early when this adapter creates a collection).
+        """
+        base = qdrant_url()
+        cached = _INFO_CACHE.get(base)
+        if cached is not None:
+            return [dict(it) for it in cached]
+
+        def _dim(n: str) -> Optional[int]:
             try:
-                dim = self.get_collection_dim(n)
+                return self.get_collection_dim(n)
             except Exception:
-                dim = None
-            out.append({"name": n, "dim": dim})
-        return out
+                return None
+
+        names = self.list_collections()
+        if len(names) > 1:
+            from concurrent.futures import ThreadPoolExecutor  # deferred: only multi-collection listings need threads
+
+            with ThreadPoolExecutor(max_workers=min(8, HTTP_POOL_SIZE, len(names))) as ex:
+                dims = list(ex.map(_dim, names))
+        else:
+            dims = [_dim(n) for n in names]
+        out = [{"name": n, "dim": d} for n, d in zip(names, dims)]
+        _INFO_CACHE.put(base, out)
+        return [dict(it) for it in out]
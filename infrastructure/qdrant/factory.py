@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from ...domain.interfaces import VectorStore
+from ..config import qdrant_transport
+from .client import QdrantVectorStore
+
+
+def make_vector_store() -> VectorStore:
+    """REST adapter by default; the gRPC adapter (optional qdrant-client) when MEMORY_QDRANT_TRANSPORT=grpc."""
+    if qdrant_transport() == "grpc":
+        from .grpc_client import QdrantGrpcVectorStore
+
+        return QdrantGrpcVectorStore()
+    return QdrantVectorStore()
+
+
+def is_missing_collection_error(ex: BaseException) -> bool:
+    """True when ``ex`` is Qdrant's "collection not found" on either transport.
+
+    REST: an HTTP 404 for a ``/collections/...`` URL (Ollama also answers 404, for unknown models).
+    gRPC: an RpcError with status NOT_FOUND, or qdrant-client's UnexpectedResponse carrying a 404.
+    """
+    response = getattr(ex, "response", None)
+    if response is not None and hasattr(response, "status_code"):
+        return response.status_code == 404 and "/collections/" in str(getattr(response, "url", ""))
+    code = getattr(ex, "code", None)
+    if callable(code):  # grpc.RpcError
+        try:
+            return getattr(code(), "name", None) == "NOT_FOUND"
+        except Exception:
+            return False
+    return type(ex).__module__.startswith("qdrant_client") and getattr(ex, "status_code", None) == 404
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Optional
+
+from ...domain.interfaces import VectorStore
+from ...domain.models import Vector, Point, QueryResult
+from ..timeouts import http_timeout_seconds
+from ..config import qdrant_url, qdrant_grpc_port, vector_quantization
+from .client import _BULK_LOAD_TUNING, _INDEXED_TUNING, _load_thread_id_from_lock
+
+try:  # optional dependency: pip install qdrant-client
+    from qdrant_client import QdrantClient
+    from qdrant_client import models as qm
+except ImportError:  # pragma: no cover - depends on environment
+    QdrantClient = None  # type: ignore[assignment,misc]
+    qm = None  # type: ignore[assignment]
+
+
+@lru_cache(maxsize=4)
+def _grpc_client(url: str, grpc_port: int, timeout: int) -> "QdrantClient":
+    """One client (and gRPC channel) per endpoint, reused across adapter instances."""
+    return QdrantClient(url=url, grpc_port=grpc_port, prefer_grpc=True, timeout=timeout)
+
+
+def _update_result(res) -> dict:
+    """REST-shaped ``{"status", "result"}`` body for a qdrant-client UpdateResult."""
+    status = getattr(res.status, "value", res.status)
+    return {"status": "ok", "result": {"operation_id": res.operation_id, "status": status}}
+
+
+class QdrantGrpcVectorStore(VectorStore):
+    """Vector store adapter for Qdrant over gRPC (qdrant-client with ``prefer_grpc=True``).
+
+    Selected with MEMORY_QDRANT_TRANSPORT=grpc. Points and vectors travel as protobuf
+    instead of JSON; semantics (thread filter, quantization, ensure policy) match the REST adapter.
+    """
+
+    def __init__(self) -> None:
+        if QdrantClient is None:
+            raise RuntimeError("MEMORY_QDRANT_TRANSPORT=grpc requires the optional 'qdrant-client' package")
+        self._client = _grpc_client(qdrant_url(), qdrant_grpc_port(), max(1, int(http_timeout_seconds())))
+
+    def _create(self, name: str, dim: int, distance: str) -> None:
+        quantization = None
+        if vector_quantization() == "int8":
+            quantization = qm.ScalarQuantization(
+                scalar=qm.ScalarQuantizationConfig(type=qm.ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+        self._client.create_collection(
+            collection_name=name,
+            vectors_config=qm.VectorParams(size=dim, distance=qm.Distance(distance)),
+            quantization_config=quantization,
+        )
+
+    def ensure_collection(self, name: str, dim: int, distance: str = "Cosine", recreate: bool = False) -> None:
+        if not self._client.collection_exists(name):
+            self._create(name, dim, distance)
+            return
+        params = self._client.get_collection(name).config.params.vectors
+        existing = getattr(params, "size", None)
+        if existing is not None and existing != dim:
+            if not recreate:
+                raise ValueError(f"Collection {name} has size={existing}, expected={dim}")
+            self._client.delete_collection(name)
+            self._create(name, dim, distance)
+
+    def upsert_points(self, name: str, points: List[Point]) -> dict:
+        structs = [qm.PointStruct(id=p.id, vector=p.vector.values, payload=p.payload) for p in points]
+        return _update_result(self._client.upsert(collection_name=name, points=structs, wait=True))
+
+    def search(
+        self,
+        name: str,
+        vector: Vector,
+        limit: int = 5,
+        with_payload: bool = True,
+        score_threshold: Optional[float] = None,
+    ) -> List[QueryResult]:
+        query_filter = None
+        tid = _load_thread_id_from_lock()
+        if tid:
+            query_filter = qm.Filter(must=[qm.FieldCondition(key="meta.thread_id", match=qm.MatchValue(value=tid))])
+        res = self._client.query_points(
+            collection_name=name,
+            query=vector.values,
+            limit=limit,
+            with_payload=with_payload,
+            with_vectors=False,
+            score_threshold=score_threshold,
+            query_filter=query_filter,
+        )
+        return [QueryResult(id=str(p.id), score=float(p.score), payload=p.payload or {}) for p in res.points]
+
+    def collection_exists(self, name: str) -> Optional[bool]:
+        return bool(self._client.collection_exists(name))
+
+    def points_count(self, name: str) -> Optional[int]:
+        """Return the number of points in a collection, or ``None`` when it does not exist."""
+        if not self._client.collection_exists(name):
+            return None
+        return self._client.get_collection(name).points_count
+
+    def list_collections(self) -> List[str]:
+        """List collection names present in Qdrant."""
+        return [c.name for c in self._client.get_collections().collections if c.name.strip()]
+
+    def delete_points(self, name: str, ids: List[str]) -> dict:
+        """Delete points by ID and wait for Qdrant to apply it."""
+        selector = qm.PointIdsList(points=list(ids))
+        return _update_result(self._client.delete(collection_name=name, points_selector=selector, wait=True))
+
+    def set_bulk_load(self, name: str, enabled: bool) -> None:
+        """Toggle bulk-load tuning (HNSW ``m`` and the optimizer indexing threshold)."""
+        tuning = _BULK_LOAD_TUNING if enabled else _INDEXED_TUNING
+        self._client.update_collection(
+            collection_name=name,
+            hnsw_config=qm.HnswConfigDiff(m=tuning["m"]),
+            optimizers_config=qm.OptimizersConfigDiff(indexing_threshold=tuning["indexing_threshold"]),
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Iterator
 import os
 
@@ -12,6 +13,7 @@ try:
         operation_timeout as _operation_timeout,
     )
 
+    @lru_cache(maxsize=1)
     def get_timeout_config():
         return _get_timeout_config()
 
@@ -26,6 +28,7 @@ except Exception:
             except Exception:
                 self.start_timeout_seconds = default
 
+    @lru_cache(maxsize=1)
     def get_timeout_config() -> _TimeoutCfg:
         return _TimeoutCfg()
 
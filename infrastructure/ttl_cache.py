@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Values keyed by e.g. Qdrant URL, each served for ``ttl_s`` seconds after it was stored.
+
+    Expiry uses the monotonic clock. Callers that hand out mutable values should copy them.
+    """
+
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+        self._entries: Dict[Hashable, Tuple[float, V]] = {}
+
+    def get(self, key: Hashable) -> Optional[V]:
+        hit = self._entries.get(key)
+        if hit is None or time.monotonic() - hit[0] >= self.ttl_s:
+            return None
+        return hit[1]
+
+    def put(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (time.monotonic(), value)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,26 +1,41 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List
 
 from ..domain.models import MemoryItem
 
 
 def load_memory_items(directory: Path) -> List[MemoryItem]:
     """Load .md files from memory-bank directory into MemoryItem list."""
-    items: List[MemoryItem] = []
-    for p in sorted(directory.glob("*.md")):
+    return list(iter_memory_items(directory))
+
+
+def iter_memory_items(directory: Path) -> Iterator[MemoryItem]:
+    """Yield one MemoryItem per .md file, reading each file only when the consumer asks for it."""
+    base = str(directory)
+    try:
+        with os.scandir(base) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".md"))
+    except OSError:  # missing directory: nothing to index
+        return
+    # ``source`` feeds the deterministic point IDs; keep it identical to ``str(directory / name)``.
+    prefix = "" if base == "." else base + os.sep
+    for name in names:
+        source = prefix + name
         try:
-            text = p.read_text(encoding="utf-8", errors="ignore")
+            # One open per file; fstat on the descriptor replaces separate exists/stat path lookups.
+            with open(source, encoding="utf-8", errors="ignore") as fh:
+                stat = os.fstat(fh.fileno())
+                text = fh.read()
         except Exception:
             continue
-        stat = p.stat()
         meta: Dict[str, object] = {
-            "source": str(p),
-            "name": p.name,
-            "modified": getattr(stat, "st_mtime", 0),
+            "source": source,
+            "name": name,
+            "modified": stat.st_mtime,
             "size_bytes": stat.st_size,
             "kind": "memory-bank",
         }
-        items.append(MemoryItem(text=text, meta=meta))
-    return items
+        yield MemoryItem(text=text, meta=meta)
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import os
-import contextlib
-import requests
+import math
+import operator
+import threading
+import time
+from collections import deque
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from ..infrastructure.logging import get_logger
 from ..infrastructure.ollama.client import OllamaEmbeddingService
-from ..infrastructure.qdrant.client import QdrantVectorStore
+from ..infrastructure.qdrant.client import _load_thread_id_from_lock
+from ..infrastructure.qdrant.factory import is_missing_collection_error, make_vector_store
 from ..infrastructure.timeouts import http_timeout_seconds, operation_timeout
-from ..infrastructure.config import qdrant_url
-from ..ingestion.memory_bank_loader import load_memory_items
+from ..infrastructure.config import parse_kv_text, delete_batch_size, embed_batch_size, embed_model, qdrant_url, qdrant_transport, semcache_threshold, upsert_concurrency
+from ..infrastructure.http import HTTP_POOL_SIZE, decode_json, http_session
+from ..infrastructure.ttl_cache import TTLCache
+from ..ingestion.memory_bank_loader import iter_memory_items
+from ..domain.models import MemoryItem, QueryResult
 from ..application.dto import EnsureCollectionRequest, UpsertMemoryRequest, QueryRequest
 from ..application.use_cases.ensure_collection import EnsureCollectionUseCase
 from ..application.use_cases.upsert_memory import UpsertMemoryUseCase
@@ -20,20 +28,41 @@ from ..application.use_cases.query_memory import QueryMemoryUseCase
 logger = get_logger("vector_memory.mcp.api")
 
 
+# Parsed .env files keyed by absolute path -> ((st_mtime_ns, st_size), parsed mapping)
+_DOTENV_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
+# Absolute path -> monotonic time until which a missing .env is not stat()ed again. Container
+# deployments usually have no .env at all; a .env created later is picked up within the TTL.
+_DOTENV_MISSING: Dict[str, float] = {}
+_DOTENV_MISSING_TTL_S = 5.0
+
+
 def _parse_dotenv(dotenv_path: Path) -> Dict[str, str]:
-    """Parse a simple .env file (KEY=VALUE per line, '#' comments)."""
-    env: Dict[str, str] = {}
-    if dotenv_path.exists():
-        with contextlib.suppress(Exception):
-            for raw in dotenv_path.read_text(encoding="utf-8", errors="ignore").splitlines():
-                s = raw.strip()
-                if not s or s.startswith("#") or "=" not in s:
-                    continue
-                k, v = s.split("=", 1)
-                k = k.strip()
-                v = v.strip().strip('"').strip("'")
-                if k:
-                    env[k] = v
+    """Parse a simple .env file (KEY=VALUE per line, '#' comments).
+
+    Every MCP entry point consults .env, so the parsed mapping is cached per path and
+    reused until the file's mtime or size changes. Callers must treat it as read-only.
+    """
+    key = str(dotenv_path.absolute())
+    missing_until = _DOTENV_MISSING.get(key)
+    if missing_until is not None and time.monotonic() < missing_until:
+        return {}
+    try:
+        st = dotenv_path.stat()
+    except OSError:
+        _DOTENV_MISSING[key] = time.monotonic() + _DOTENV_MISSING_TTL_S
+        return {}
+    _DOTENV_MISSING.pop(key, None)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _DOTENV_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        text = dotenv_path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:  # unreadable (permissions, a directory named .env, ...): treat as absent
+        return {}
+    env = parse_kv_text(text)
+    _DOTENV_CACHE[key] = (stamp, env)
     return env
 
 
@@ -49,51 +78,52 @@ def _env_get(key: str) -> Optional[str]:
 
 def _list_additional_collections() -> list[str]:
     """List configured additional collections from env/.env (MEMORY_COLLECTION_NAME_2+)."""
-    out: list[str] = []
-    merged: Dict[str, str] = {}
-    merged.update(_parse_dotenv(Path(".env")))
-    for k, v in os.environ.items():
-        if isinstance(k, str) and isinstance(v, str):
-            merged[k] = v
-    out.extend(
-        v.strip()
-        for k, v in merged.items()
-        if k.startswith("MEMORY_COLLECTION_NAME_")
-        and isinstance(v, str)
-        and v.strip()
-    )
-    # de-duplicate preserving order
-    seen: set[str] = set()
-    uniq: list[str] = []
-    for n in out:
-        if n not in seen:
-            seen.add(n)
-            uniq.append(n)
-    return uniq
+    prefix = "MEMORY_COLLECTION_NAME_"
+    # Only prefixed keys are collected (no copy of the whole environment); a process value
+    # replaces the .env value for the same key while keeping the .env declaration position.
+    found = {k: v for k, v in _parse_dotenv(Path(".env")).items() if k.startswith(prefix)}
+    found.update((k, v) for k, v in os.environ.items() if k.startswith(prefix))
+    # strip, drop empties, de-duplicate preserving order
+    return list(dict.fromkeys(n for n in (v.strip() for v in found.values()) if n))
 
 
 def _allowed_collections() -> list[str]:
     """Allowed collection names declared in env/.env: primary + MEMORY_COLLECTION_NAME_2..N."""
-    allowed: list[str] = []
     primary = _env_get("MEMORY_COLLECTION_NAME")
-    if primary and primary not in allowed:
-        allowed.append(primary)
-    for n in _list_additional_collections():
-        if n and n not in allowed:
-            allowed.append(n)
-    return allowed
+    return list(dict.fromkeys(n for n in (primary, *_list_additional_collections()) if n))
+
+
+# qdrant_url -> collection names; polling agents hit the error paths back to back.
+_COLLECTIONS_CACHE: TTLCache[list[str]] = TTLCache(5.0)
 
 
 def _list_qdrant_collections() -> list[str]:
-    """Fetch current Qdrant collections for helpful error messages."""
+    """Fetch current Qdrant collections for helpful error messages.
+
+    Successful listings are cached per Qdrant URL for a few seconds; failures are not cached.
+    """
     try:
-        timeout = http_timeout_seconds()
         base = qdrant_url()
-        with operation_timeout(timeout):
-            return list_collections(base, timeout)
+        cached = _COLLECTIONS_CACHE.get(base)
+        if cached is not None:
+            return list(cached)
+        if qdrant_transport() == "grpc":
+            cols = sorted(set(_get_store().list_collections()))
+        else:
+            timeout = http_timeout_seconds()
+            with operation_timeout(timeout):
+                cols = list_collections(base, timeout)
+        _COLLECTIONS_CACHE.put(base, cols)
+        return list(cols)
     except Exception:
         return []
 
+
+def _invalidate_collections_cache() -> None:
+    """Drop cached collection listings so the next lookup reflects Qdrant's current state."""
+    _COLLECTIONS_CACHE.clear()
+
+
 def list_collections(base, timeout):
     """
     Helper function to fetch and list all Qdrant collection names.
@@ -108,9 +138,9 @@ def list_collections(base, timeout):
     Returns:
         list[str]: A sorted list of collection names.
     """
-    r = requests.get(f"{base}/collections", timeout=timeout)
+    r = http_session().get(f"{base}/collections", timeout=timeout)
     r.raise_for_status()
-    data = r.json() or {}
+    data = decode_json(r) or {}
     cols: list[str] = []
     for it in (data.get("result", {}).get("collections") or []):
         name = it.get("name")
@@ -119,75 +149,298 @@ def list_collections(base, timeout):
     return sorted(set(cols))
 
 
-def vector_create_collection(collection: str, dim: Optional[int] = None, distance: str = "Cosine", recreate: bool = False) -> Dict[str, Any]:
-    """Create/ensure a collection, gated by env allowlist (primary + *_2..N)."""
-    emb = OllamaEmbeddingService()
-    store = QdrantVectorStore()
+_ADAPTER_LOCK = threading.Lock()
+_EMB: Optional[OllamaEmbeddingService] = None
+_STORE: Optional[Any] = None
+
+
+def _get_emb() -> OllamaEmbeddingService:
+    """Process-wide embedding adapter, built on first use and shared by every MCP call."""
+    global _EMB
+    if _EMB is None:
+        with _ADAPTER_LOCK:
+            if _EMB is None:
+                _EMB = OllamaEmbeddingService()
+    return _EMB
+
+
+def _get_store():
+    """Process-wide vector store adapter (transport chosen on first use), shared by every MCP call."""
+    global _STORE
+    if _STORE is None:
+        with _ADAPTER_LOCK:
+            if _STORE is None:
+                _STORE = make_vector_store()
+    return _STORE
+
+
+# Recent query results for the opt-in semantic cache (MEMORY_SEMCACHE_THRESHOLD):
+# (monotonic time stored, search key, unit-length query vector, serialized results), newest last.
+# Writes through this API clear it; the TTL bounds how long writes by other processes go unseen.
+_SEMCACHE_SIZE = 64
+_SEMCACHE_TTL_S = 5.0
+_SEMCACHE: Deque[Tuple[float, tuple, List[float], List[Dict[str, Any]]]] = deque(maxlen=_SEMCACHE_SIZE)
+_SEMCACHE_LOCK = threading.Lock()
+
+
+def _unit(values: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in values))
+    return [v / norm for v in values] if norm else list(values)
+
+
+def _semcache_lookup(key: tuple, unit: List[float], threshold: float) -> Optional[List[Dict[str, Any]]]:
+    """Results of the most similar unexpired cached query with the same search key, if its cosine >= ``threshold``."""
+    with _SEMCACHE_LOCK:
+        entries = list(_SEMCACHE)
+    cutoff = time.monotonic() - _SEMCACHE_TTL_S
+    best: Optional[List[Dict[str, Any]]] = None
+    best_sim = threshold
+    for stored_at, k, u, result in entries:
+        if stored_at > cutoff and k == key and len(u) == len(unit):
+            sim = sum(map(operator.mul, u, unit))
+            if sim >= best_sim:
+                best, best_sim = result, sim
+    return best
+
+
+def _semcache_clear() -> None:
+    """Forget cached query results; called whenever this API writes to Qdrant."""
+    with _SEMCACHE_LOCK:
+        _SEMCACHE.clear()
+
+
+# (qdrant_url, collection) pairs Qdrant reported as holding no points. Only counted after a search
+# came back empty; while listed, queries answer [] without embedding. Writes through this API drop
+# the entry, and the short TTL bounds how long points written by other processes stay hidden.
+_EMPTY: TTLCache[bool] = TTLCache(5.0)
+
+
+def _known_empty(collection: str) -> bool:
+    return _EMPTY.get((qdrant_url(), collection)) is not None
+
+
+def _note_if_empty(collection: str) -> None:
+    """Remember ``collection`` as empty when Qdrant reports zero points (an empty search is otherwise ambiguous)."""
+    try:
+        count = _get_store().points_count(collection)
+    except Exception:  # best effort: the search already succeeded
+        return
+    if count == 0:
+        _EMPTY.put((qdrant_url(), collection), True)
+
+
+def _after_write(collection: str) -> None:
+    """Drop query-side state a write (or recreate) through this API may have made stale."""
+    _EMPTY.pop((qdrant_url(), collection))
+    _semcache_clear()
+
+
+# (qdrant_url, collection, dim, distance) -> monotonic time it was last ensured. Agents call
+# vector_create_collection defensively; repeats within the TTL skip Qdrant entirely, and the
+# TTL bounds how long a collection deleted behind our back goes unnoticed.
+_ENSURED_TTL_S = 300.0
+_ENSURED: Dict[Tuple[str, str, int, str], float] = {}
+
+
+def _not_declared(collection: str, allowed: list[str]) -> Dict[str, Any]:
+    """Error payload for a collection outside the env allowlist."""
+    return {
+        "status": "error",
+        "error": f"Collection '{collection}' is not declared in environment (.env). "
+                 f"Add it as MEMORY_COLLECTION_NAME or MEMORY_COLLECTION_NAME_2..N before creation.",
+        "requested": collection,
+        "allowed_env_collections": allowed,
+        "available_collections": _list_qdrant_collections(),
+    }
+
+
+def vector_create_collection(collection: str, dim: Optional[int] = None, distance: str = "Cosine", recreate: bool = False, bulk_load: bool = False) -> Dict[str, Any]:
+    """Create/ensure a collection, gated by env allowlist (primary + *_2..N).
+
+    ``bulk_load=True`` pauses HNSW indexing for a large ingest; call vector_finalize_collection afterwards.
+    """
+    emb = _get_emb()
+    store = _get_store()
     allowed = _allowed_collections()
     if collection not in allowed:
-        return {
-            "status": "error",
-            "error": f"Collection '{collection}' is not declared in environment (.env). "
-                     f"Add it as MEMORY_COLLECTION_NAME or MEMORY_COLLECTION_NAME_2..N before creation.",
-            "requested": collection,
-            "allowed_env_collections": allowed,
-            "available_collections": _list_qdrant_collections(),
-        }
+        return _not_declared(collection, allowed)
+    size = int(dim or emb.get_dimension())
+    key = (qdrant_url(), collection, size, distance)
+    ensured_at = _ENSURED.get(key)
+    if not (recreate or bulk_load) and ensured_at is not None and time.monotonic() - ensured_at < _ENSURED_TTL_S:
+        return {"status": "ok", "collection": collection, "dimension": size, "distance": distance}
+    _ENSURED.pop(key, None)
     EnsureCollectionUseCase(emb, store).execute(
-        EnsureCollectionRequest(collection=collection, dim=dim, distance=distance, recreate=recreate)
+        EnsureCollectionRequest(collection=collection, dim=dim, distance=distance, recreate=recreate, bulk_load=bulk_load)
     )
-    return {"status": "ok", "collection": collection, "dimension": int(dim or emb.get_dimension()), "distance": distance}
+    _ENSURED[key] = time.monotonic()
+    _invalidate_collections_cache()
+    _after_write(collection)
+    return {"status": "ok", "collection": collection, "dimension": size, "distance": distance}
+
+
+def vector_finalize_collection(collection: str) -> Dict[str, Any]:
+    """Restore normal HNSW indexing after a ``bulk_load`` ingest, gated by the env allowlist."""
+    allowed = _allowed_collections()
+    if collection not in allowed:
+        return _not_declared(collection, allowed)
+    _get_store().set_bulk_load(collection, False)
+    return {"status": "ok", "collection": collection}
+
+
+def _upsert_in_batches(use_case: UpsertMemoryUseCase, collection: str, items: Iterable[MemoryItem], id_namespace: str) -> Tuple[int, Dict[str, Any]]:
+    """
+    Embed and upsert ``items`` in MEMORY_EMBED_BATCH_SIZE batches, MEMORY_UPSERT_CONCURRENCY at a time.
+
+    ``items`` is consumed lazily as a pipeline: while one batch waits on Qdrant the next is already
+    being read and embedded, and at most ``workers`` batches (texts plus vectors) are resident at once.
+    Returns ``(indexed, raw)`` where ``raw`` is the provider JSON of a single batch, or of the last
+    batch with ``time`` summed. No items still yields the use case's empty response.
+    """
+    step = embed_batch_size()
+    it = iter(items)
+
+    def _upsert(batch: List[MemoryItem]) -> Dict[str, Any]:
+        return use_case.execute(UpsertMemoryRequest(collection=collection, items=batch, id_namespace=id_namespace)).raw
+
+    first = list(islice(it, step))
+    second = list(islice(it, step))
+    if not second:
+        return len(first), _upsert(first)
+    from concurrent.futures import ThreadPoolExecutor  # deferred: only multi-batch ingests need threads
+
+    batches = chain((first, second), iter(lambda: list(islice(it, step)), []))
+    workers = min(upsert_concurrency(), HTTP_POOL_SIZE)
+    indexed, total_time, raw = 0, 0.0, None
+    pending: deque = deque()
+
+    def _collect() -> None:
+        nonlocal indexed, total_time, raw
+        fut, n = pending.popleft()
+        raw, indexed = fut.result(), indexed + n
+        total_time += float((raw or {}).get("time") or 0.0)
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for batch in batches:
+            pending.append((ex.submit(_upsert, batch), len(batch)))
+            if len(pending) >= workers:
+                _collect()
+        while pending:
+            _collect()
+    out = dict(raw or {})
+    out["time"] = total_time
+    return indexed, out
 
 
 def vector_index_memory_bank(collection: str, directory: str = "memory-bank", id_namespace: str = "mem", max_items: Optional[int] = None) -> Dict[str, Any]:
-    emb = OllamaEmbeddingService()
-    store = QdrantVectorStore()
+    emb = _get_emb()
+    store = _get_store()
     root = Path(directory)
-    items = load_memory_items(root)
+    items: Iterable[MemoryItem] = iter_memory_items(root)
     if max_items:
-        items = items[: int(max_items)]
-    logger.info("MCP index | collection=%s | dir=%s | candidates=%d", collection, root, len(items))
-    resp = UpsertMemoryUseCase(emb, store).execute(
-        UpsertMemoryRequest(collection=collection, items=items, id_namespace=id_namespace)
-    )
-    return resp.raw  # provider JSON
+        items = islice(items, int(max_items))
+    indexed, raw = _upsert_in_batches(UpsertMemoryUseCase(emb, store), collection, items, id_namespace)
+    logger.info("MCP index | collection=%s | dir=%s | indexed=%d", collection, root, indexed)
+    _after_write(collection)
+    return raw  # provider JSON
+
+
+def _result_dict(r: QueryResult) -> Dict[str, Any]:
+    """Fresh ``{id, score, payload}`` mapping for a match; never the instance ``__dict__`` itself."""
+    return {"id": r.id, "score": r.score, "payload": r.payload}
 
 
 def vector_query(collection: str, q: str, k: int = 5, with_payload: bool = True, score_threshold: Optional[float] = None) -> Dict[str, Any]:
     """Query a collection; if the collection does not exist, return an error listing available names."""
-    emb = OllamaEmbeddingService()
-    store = QdrantVectorStore()
-    available = _list_qdrant_collections()
-    if collection not in available:
-        return {
-            "status": "error",
-            "error": f"Collection '{collection}' does not exist in Qdrant.",
-            "requested": collection,
-            "available_collections": available,
-        }
-    results = QueryMemoryUseCase(emb, store).execute(
-        QueryRequest(
-            collection=collection,
-            query=q,
-            k=k,
-            with_payload=with_payload,
-            score_threshold=score_threshold,
-        )
+    req = QueryRequest(
+        collection=collection,
+        query=q,
+        k=k,
+        with_payload=with_payload,
+        score_threshold=score_threshold,
+    )
+    # A fresh listing (kept after an earlier miss) already proves the collection is absent: no embedding.
+    listed = _COLLECTIONS_CACHE.get(qdrant_url())
+    if listed is not None and collection not in listed:
+        return _missing_collection(collection, list(listed))
+    if _known_empty(collection):
+        return {"status": "ok", "collection": collection, "result": []}
+    # Optimistic: query straight away and only list collections when Qdrant reports the collection
+    # missing, so the happy path costs no extra round trip. Any other failure propagates untouched.
+    try:
+        result = _run_query(QueryMemoryUseCase(_get_emb(), _get_store()), req)
+    except Exception as ex:
+        if not is_missing_collection_error(ex):
+            raise
+        _invalidate_collections_cache()
+        available = _list_qdrant_collections()
+        if collection in available:
+            raise
+        return _missing_collection(collection, available)
+    if not result:
+        _note_if_empty(collection)
+    return {"status": "ok", "collection": collection, "result": result}
+
+
+def _missing_collection(collection: str, available: list[str]) -> Dict[str, Any]:
+    """Error payload for a query against a collection Qdrant does not have."""
+    return {
+        "status": "error",
+        "error": f"Collection '{collection}' does not exist in Qdrant.",
+        "requested": collection,
+        "available_collections": available,
+    }
+
+
+def _run_query(use_case: QueryMemoryUseCase, req: QueryRequest) -> List[Dict[str, Any]]:
+    """Serialized matches for ``req``, served from the semantic cache when it is enabled and hits."""
+    threshold = semcache_threshold()
+    if threshold is None:
+        return [_result_dict(r) for r in use_case.execute(req)]
+
+    # Near-identical queries (cosine >= threshold) against the same search reuse the earlier hits.
+    vec = use_case.embed_query(req.query)
+    key = (
+        qdrant_url(), embed_model(), req.collection, req.k, req.with_payload, req.score_threshold,
+        _load_thread_id_from_lock(),
     )
-    return {"status": "ok", "collection": collection, "result": [r.__dict__ for r in results]}
+    unit = _unit(vec.values)
+    result = _semcache_lookup(key, unit, threshold)
+    if result is None:
+        result = [_result_dict(r) for r in use_case.search(req, vec)]
+        with _SEMCACHE_LOCK:
+            _SEMCACHE.append((time.monotonic(), key, unit, result))
+    return [dict(r) for r in result]
 
 
 def vector_delete(collection: str, ids: Sequence[str]) -> Dict[str, Any]:
-    """Simple delete by IDs using Qdrant REST; scoped to MCP surface only."""
-    import requests
-    from ..infrastructure.timeouts import http_timeout_seconds, operation_timeout
-    from ..infrastructure.config import qdrant_url
-
-    timeout = http_timeout_seconds()
-    base = qdrant_url()
-    url = f"{base}/collections/{collection}/points/delete?wait=true"
-    body = {"points": list(ids)}
-    with operation_timeout(timeout):
-        r = requests.post(url, json=body, timeout=timeout)
-        r.raise_for_status()
-        return r.json()
+    """
+    Delete by IDs (REST, or gRPC when MEMORY_QDRANT_TRANSPORT=grpc); scoped to MCP surface only.
+
+    IDs are sent in MEMORY_DELETE_BATCH_SIZE batches, one after another, so a large list never
+    becomes a single request that Qdrant times out on. A single batch returns the provider JSON
+    as-is; otherwise the last batch's response is returned with ``time`` summed.
+    """
+    ids = list(ids)
+    step = delete_batch_size()
+    batches = [ids[i:i + step] for i in range(0, len(ids), step)] or [ids]
+    responses = []
+    if qdrant_transport() == "grpc":
+        store = _get_store()
+        for batch in batches:
+            responses.append(store.delete_points(collection, batch))
+    else:
+        session = http_session()
+        timeout = http_timeout_seconds()
+        url = f"{qdrant_url()}/collections/{collection}/points/delete?wait=true"
+        for batch in batches:
+            with operation_timeout(timeout):
+                r = session.post(url, json={"points": batch}, timeout=timeout)
+                r.raise_for_status()
+                responses.append(r.json())
+    _after_write(collection)
+    if len(responses) == 1:
+        return responses[0]
+    out = dict(responses[-1] or {})
+    out["time"] = sum(float((resp or {}).get("time") or 0.0) for resp in responses)
+    return out
@@ -123,9 +123,40 @@ def pytest_configure(config):
 @pytest.fixture(autouse=True)
 def reset_mocks():
     """Automatically reset all mocks after each test."""
+    _reset_process_state()
     yield
     # This runs after each test - any cleanup can go here
-    pass
+    _reset_process_state()
+
+
+def _reset_process_state():
+    """Drop the per-process settings, caches and adapters a previous test may have filled."""
+    from vector_memory.infrastructure import config
+    from vector_memory.infrastructure.timeouts import get_timeout_config
+    from vector_memory.infrastructure.ollama import client as ollama_client
+    from vector_memory.infrastructure.qdrant import client as qdrant_client
+    from vector_memory.application.embedding_cache import shared_embedding_cache
+    from vector_memory.cli import main as cli_main
+    from vector_memory.mcp import api as mcp_api
+
+    # Settings are memoized per process; start every test from the current environment.
+    config.clear_cache()
+    get_timeout_config.cache_clear()
+    # Embeddings cached by one test must not turn another test's provider call into a hit.
+    shared_embedding_cache().clear()
+    ollama_client._DIM_CACHE.clear()
+    qdrant_client._LOCK_CACHE.clear()
+    qdrant_client._INFO_CACHE.clear()
+    cli_main._invalidate_collections_cache()
+    cli_main._DOTENV_CACHE.clear()
+    # MCP keeps adapters, .env state and query-side caches at module level.
+    mcp_api._invalidate_collections_cache()
+    mcp_api._DOTENV_CACHE.clear()
+    mcp_api._DOTENV_MISSING.clear()
+    mcp_api._EMB = mcp_api._STORE = None
+    mcp_api._semcache_clear()
+    mcp_api._EMPTY.clear()
+    mcp_api._ENSURED.clear()
 
 
 class MockNamespace:
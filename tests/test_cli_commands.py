@@ -50,6 +50,17 @@ class TestCommandParsing:
         assert args.distance == "Euclidean"
         assert args.recreate is True
 
+    def test_parser_reused_without_leaking_state(self):
+        """Test the cached parser is shared and repeated parses do not accumulate values."""
+        parser = build_parser()
+
+        first = parser.parse_args(["remember", "--text", "a", "--tag", "x"])
+        second = parser.parse_args(["remember", "--text", "b"])
+
+        assert build_parser() is parser
+        assert first.text == ["a"] and first.tag == ["x"]
+        assert second.text == ["b"] and second.tag == []
+
     def test_index_memory_bank_args(self):
         """Test index-memory-bank argument parsing."""
         parser = build_parser()
@@ -128,6 +139,7 @@ class TestCommandParsing:
         assert args.tool_calls == '{"calls": []}'
         assert args.files == ["file1.py", "file2.py"]
         assert args.chunk_chars == 2000
+        assert args.batch_size == 64
 
     def test_remember_args(self):
         """Test remember command argument parsing."""
@@ -166,32 +178,31 @@ class TestCommandDispatch:
         assert result == 0
         mock_new_project.assert_called_once_with(mock_emb, mock_store)
 
-    @patch('vector_memory.cli.main._extracted_from_dispatch_commands_15')
-    def test_dispatch_ensure_collection(self, mock_ensure):
+    def test_dispatch_ensure_collection(self):
         """Test ensure-collection command dispatch."""
         mock_emb = Mock()
         mock_store = Mock()
-        mock_ensure.return_value = 0
+        mock_ensure = Mock(return_value=0)
 
         ns = Namespace(cmd="ensure-collection", name="test")
-        result = dispatch_commands(ns, mock_emb, mock_store)
+        with patch.dict('vector_memory.cli.main._HANDLERS', {"ensure-collection": mock_ensure}):
+            result = dispatch_commands(ns, mock_emb, mock_store)
 
         assert result == 0
         mock_ensure.assert_called_once_with(ns, mock_emb, mock_store)
 
-    def test_dispatch_unknown_command(self):
+    def test_dispatch_unknown_command(self, capsys):
         """Test unknown command returns error."""
         mock_emb = Mock()
         mock_store = Mock()
 
         ns = Namespace(cmd="unknown-command")
 
-        with patch('builtins.print') as mock_print:
-            result = dispatch_commands(ns, mock_emb, mock_store)
+        result = dispatch_commands(ns, mock_emb, mock_store)
 
         assert result == 2
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         assert "Unknown command: unknown-command" in call_args
 
 
@@ -218,9 +229,8 @@ class TestEnsureCollectionCommand:
             recreate=False
         )
 
-        with patch('builtins.print') as mock_print:
-            from vector_memory.cli.main import _extracted_from_dispatch_commands_15
-            result = _extracted_from_dispatch_commands_15(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import _handle_ensure
+        result = _handle_ensure(ns, mock_emb, mock_store)
 
         assert result == 0
         mock_use_case_class.assert_called_once_with(mock_emb, mock_store)
@@ -234,9 +244,34 @@ class TestEnsureCollectionCommand:
         assert call_args.distance == "Cosine"
         assert call_args.recreate is False
 
+    def test_bulk_load_with_store_lacking_tuning(self):
+        """Test a VectorStore that does not override set_bulk_load still ensures with bulk_load=True."""
+        from vector_memory.application.use_cases.ensure_collection import EnsureCollectionUseCase
+        from vector_memory.domain.interfaces import VectorStore
+
+        class MinimalStore(VectorStore):
+            def __init__(self):
+                self.ensured = []
+
+            def ensure_collection(self, name, dim, distance="Cosine", recreate=False):
+                self.ensured.append((name, dim))
+
+            def upsert_points(self, name, points):
+                return {}
+
+            def search(self, name, vector, limit=5, with_payload=True, score_threshold=None):
+                return []
+
+        store = MinimalStore()
+        EnsureCollectionUseCase(Mock(), store).execute(
+            EnsureCollectionRequest(collection="c", dim=4, bulk_load=True)
+        )
+
+        assert store.ensured == [("c", 4)]
+
     @patch('vector_memory.cli.main._allowed_collections')
     @patch('vector_memory.cli.main._list_qdrant_collections')
-    def test_ensure_collection_not_allowed(self, mock_qdrant_collections, mock_allowed):
+    def test_ensure_collection_not_allowed(self, mock_qdrant_collections, mock_allowed, capsys):
         """Test collection creation fails when not in allowed list."""
         mock_allowed.return_value = ["allowed_collection"]
         mock_qdrant_collections.return_value = []
@@ -251,13 +286,12 @@ class TestEnsureCollectionCommand:
             recreate=False
         )
 
-        with patch('builtins.print') as mock_print:
-            from vector_memory.cli.main import _extracted_from_dispatch_commands_15
-            result = _extracted_from_dispatch_commands_15(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import _handle_ensure
+        result = _handle_ensure(ns, mock_emb, mock_store)
 
         assert result == 2
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         error_data = json.loads(call_args)
         assert error_data["status"] == "error"
         assert "not declared in environment" in error_data["error"]
@@ -292,9 +326,8 @@ class TestQueryCommands:
             with_payload=True
         )
 
-        with patch('builtins.print') as mock_print:
-            from vector_memory.cli.main import _execute_command
-            result = _execute_command(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import _query_like
+        result = _query_like(ns, mock_emb, mock_store)
 
         assert result == 0
         mock_use_case.execute.assert_called_once()
@@ -309,7 +342,7 @@ class TestQueryCommands:
 
     @patch('vector_memory.cli.main._resolve_collection_name')
     @patch('vector_memory.cli.main._list_qdrant_collections')
-    def test_query_collection_not_found(self, mock_collections, mock_resolve):
+    def test_query_collection_not_found(self, mock_collections, mock_resolve, capsys):
         """Test query fails when collection doesn't exist."""
         mock_resolve.return_value = "missing_collection"
         mock_collections.return_value = ["existing_collection"]
@@ -319,13 +352,12 @@ class TestQueryCommands:
 
         ns = Namespace(name="missing_collection", q="test", k=5, with_payload=True)
 
-        with patch('builtins.print') as mock_print:
-            from vector_memory.cli.main import _execute_command
-            result = _execute_command(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import _query_like
+        result = _query_like(ns, mock_emb, mock_store)
 
         assert result == 2
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         error_data = json.loads(call_args)
         assert error_data["status"] == "error"
         assert "does not exist" in error_data["error"]
@@ -353,9 +385,8 @@ class TestQueryCommands:
             score_threshold=0.7
         )
 
-        with patch('builtins.print'):
-            from vector_memory.cli.main import _recall
-            result = _recall(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import _query_like
+        result = _query_like(ns, mock_emb, mock_store)
 
         assert result == 0
 
@@ -363,6 +394,182 @@ class TestQueryCommands:
         request = mock_use_case.execute.call_args[0][0]
         assert request.score_threshold == 0.7
 
+    @patch('vector_memory.cli.main._resolve_collection_name', return_value="c")
+    @patch('vector_memory.cli.main._list_qdrant_collections', return_value=["c"])
+    @patch('vector_memory.cli.main.QueryMemoryUseCase')
+    def test_recall_with_parsed_namespace(self, mock_use_case_class, mock_collections, mock_resolve):
+        """Test argparse-typed values reach the request unchanged."""
+        mock_use_case_class.return_value.execute.return_value = []
+        ns = build_parser().parse_args(["recall", "--q", "hello", "--k", "3", "--score-threshold", "0.25"])
+
+        from vector_memory.cli.main import _query_like
+        assert _query_like(ns, Mock(), Mock()) == 0
+
+        request = mock_use_case_class.return_value.execute.call_args[0][0]
+        assert (request.query, request.k, request.with_payload, request.score_threshold) == ("hello", 3, True, 0.25)
+        assert type(request.k) is int and type(request.score_threshold) is float
+
+
+class TestCollectionPreflight:
+    """Test the shared collection existence preflight."""
+
+    @patch('vector_memory.cli.main._resolve_collection_name', return_value="c")
+    @patch('vector_memory.cli.main._list_qdrant_collections')
+    def test_positive_probe_skips_listing(self, mock_list, mock_resolve):
+        """Test a store reporting the collection exists avoids listing all collections."""
+        from vector_memory.cli.main import _existing_collection
+
+        store = Mock()
+        store.collection_exists.return_value = True
+
+        assert _existing_collection(Namespace(name="c"), store) == "c"
+        mock_list.assert_not_called()
+
+    @patch('vector_memory.cli.main._resolve_collection_name', return_value="c")
+    @patch('vector_memory.cli.main._list_qdrant_collections', return_value=["c"])
+    def test_unknown_probe_falls_back_to_listing(self, mock_list, mock_resolve):
+        """Test an unavailable probe (None or error) falls back to the listing."""
+        from vector_memory.cli.main import _existing_collection
+
+        store = Mock()
+        store.collection_exists.side_effect = RuntimeError("old server")
+
+        assert _existing_collection(Namespace(name="c"), store) == "c"
+        mock_list.assert_called_once()
+
+
+class TestSerializeQueryResult:
+    """Test conversion of query matches into JSON-ready mappings."""
+
+    def test_serialize_domain_query_result(self):
+        """Test store results serialize id, score, payload, and preview text."""
+        from vector_memory.cli.main import _serialize_query_result
+        from vector_memory.domain.models import QueryResult
+
+        result = QueryResult(id="p1", score=0.5, payload={"text_preview": "hello", "meta": {}})
+
+        assert _serialize_query_result(result) == {
+            "id": "p1",
+            "score": 0.5,
+            "payload": {"text_preview": "hello", "meta": {}},
+            "text": "hello",
+        }
+
+    def test_serialize_arbitrary_object(self):
+        """Test objects without payload still expose explicit text and score."""
+        from vector_memory.cli.main import _serialize_query_result
+
+        result = Namespace(score=1, text="plain")
+
+        assert _serialize_query_result(result) == {"score": 1.0, "text": "plain"}
+
+    def test_serialize_slotted_object(self):
+        """Test objects declaring __slots__ are read field by field."""
+        from vector_memory.cli.main import _serialize_query_result
+
+        class SlottedMatch:
+            __slots__ = ("id", "score", "payload")
+
+            def __init__(self):
+                self.id = "s1"
+                self.score = 0.25
+                self.payload = {"text": "slot text"}
+
+        assert _serialize_query_result(SlottedMatch()) == {
+            "id": "s1",
+            "score": 0.25,
+            "payload": {"text": "slot text"},
+            "text": "slot text",
+        }
+
+
+class TestStartupImports:
+    """Test the CLI module stays cheap to import."""
+
+    def test_cli_import_skips_heavy_modules(self):
+        """Test importing the CLI does not pull in requests, logging or thread pools."""
+        import os
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, vector_memory.cli.main; "
+            "print([m for m in ('requests', 'logging', 'concurrent.futures') if m in sys.modules])"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+        assert out.stdout.strip() == "[]"
+
+
+class TestJsonOutput:
+    """Test the CLI JSON helpers with and without orjson."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_round_trip(self, use_orjson):
+        """Test both encoders produce equivalent JSON."""
+        from vector_memory.cli import main as cli_main
+
+        payload = {"status": "ok", "result": [{"id": "a", "score": 0.5, "text": "naïve"}]}
+        backend = cli_main.orjson if use_orjson else None
+        with patch.object(cli_main, "orjson", backend):
+            assert json.loads(cli_main._dumps(payload, indent=2)) == payload
+            assert cli_main._loads(cli_main._dumps(payload)) == payload
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_dumps_escapes_non_ascii_with_or_without_orjson(self, indent):
+        """Test output bytes match stdlib ensure_ascii JSON whichever encoder is used."""
+        from vector_memory.cli import main as cli_main
+
+        payload = {"text": "café ✓", "n": [1, 2]}
+        with patch.object(cli_main, "orjson", None):
+            expected = cli_main._dumps(payload, indent)
+        assert expected.isascii()
+        assert cli_main._dumps(payload, indent) == expected
+        assert cli_main._dumps({"text": "plain"}, indent) == cli_main._dumps_std({"text": "plain"}, indent)
+
+    @pytest.mark.parametrize("tty,expect_newlines", [(True, True), (False, False)])
+    def test_emit_indents_only_on_tty(self, tty, expect_newlines, capsys):
+        """Test pretty-printing is reserved for terminals; piped output stays compact."""
+        from vector_memory.cli import main as cli_main
+
+        with patch.object(cli_main, "_stdout_is_tty", return_value=tty):
+            cli_main._emit({"status": "ok", "collection": "c"}, indent=2)
+
+        text = capsys.readouterr().out
+        assert ("\n" in text.rstrip("\n")) is expect_newlines
+        assert json.loads(text) == {"status": "ok", "collection": "c"}
+
+    @pytest.mark.parametrize("size", [1, 1000])
+    def test_emit_single_buffer_write_for_any_size(self, size):
+        """Test small and large documents alike land in stdout's binary buffer in one write."""
+        import io
+        from vector_memory.cli import main as cli_main
+
+        out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        payload = {"result": ["x" * 100] * size}
+        with patch.object(cli_main.sys, "stdout", out), patch.object(out.buffer, "write", wraps=out.buffer.write) as write:
+            cli_main._emit(payload, indent=2)
+
+        write.assert_called_once()
+        raw = out.buffer.getvalue()
+        assert raw.endswith(b"\n")
+        assert json.loads(raw) == payload
+
+    def test_emit_non_ascii_to_ascii_stdout(self):
+        """Test non-ASCII payloads are written without UnicodeEncodeError to a non-UTF-8 stdout."""
+        import io
+        from vector_memory.cli import main as cli_main
+
+        out = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+        with patch.object(cli_main.sys, "stdout", out):
+            cli_main._emit({"text": "café ✓"})
+            cli_main._emit({"status": "error", "error": "ValueError: naïve ✗"})
+
+        first, second = out.buffer.getvalue().decode("ascii").splitlines()
+        assert json.loads(first) == {"text": "café ✓"}
+        assert json.loads(second)["error"] == "ValueError: naïve ✗"
+
 
 class TestStoreTurnCommand:
     """Test store-turn command implementation."""
@@ -398,9 +605,8 @@ class TestStoreTurnCommand:
             chunk_chars=None
         )
 
-        with patch('builtins.print') as mock_print:
-            from vector_memory.cli.main import store_turn
-            result = store_turn(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import store_turn
+        result = store_turn(ns, mock_emb, mock_store)
 
         assert result == 0
         mock_use_case.execute.assert_called_once()
@@ -422,7 +628,7 @@ class TestStoreTurnCommand:
 
     @patch('vector_memory.cli.main._resolve_collection_name')
     @patch('vector_memory.cli.main._list_qdrant_collections')
-    def test_store_turn_collection_missing(self, mock_collections, mock_resolve):
+    def test_store_turn_collection_missing(self, mock_collections, mock_resolve, capsys):
         """Test store-turn fails when collection doesn't exist."""
         mock_resolve.return_value = "missing_collection"
         mock_collections.return_value = []
@@ -437,13 +643,12 @@ class TestStoreTurnCommand:
             text="test message"
         )
 
-        with patch('builtins.print') as mock_print:
-            from vector_memory.cli.main import store_turn
-            result = store_turn(ns, mock_emb, mock_store)
+        from vector_memory.cli.main import store_turn
+        result = store_turn(ns, mock_emb, mock_store)
 
         assert result == 2
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         error_data = json.loads(call_args)
         assert error_data["status"] == "error"
 
@@ -452,7 +657,7 @@ class TestCLIIntegration:
     """Integration tests for CLI entry point."""
 
     @patch('vector_memory.cli.main.OllamaEmbeddingService')
-    @patch('vector_memory.cli.main.QdrantVectorStore')
+    @patch('vector_memory.cli.main.make_vector_store')
     @patch('vector_memory.cli.main.dispatch_commands')
     def test_run_success(self, mock_dispatch, mock_store_class, mock_emb_class):
         """Test successful CLI run."""
@@ -469,21 +674,36 @@ class TestCLIIntegration:
         mock_store_class.assert_called_once()
         mock_dispatch.assert_called_once_with(mock.ANY, mock_emb, mock_store)
 
+    @patch('vector_memory.cli.main.dispatch_commands')
+    def test_run_grpc_without_qdrant_client_reports_json(self, mock_dispatch, monkeypatch, capsys):
+        """Test a gRPC transport without qdrant-client installed is reported as a JSON error."""
+        from vector_memory.infrastructure.qdrant import grpc_client
+
+        monkeypatch.setenv("MEMORY_QDRANT_TRANSPORT", "grpc")
+        monkeypatch.setattr(grpc_client, "QdrantClient", None)
+
+        result = run(["recall", "--q", "hi"])
+
+        assert result == 3
+        mock_dispatch.assert_not_called()
+        error_data = json.loads(capsys.readouterr().out)
+        assert error_data["status"] == "error"
+        assert "qdrant-client" in error_data["error"]
+
     @patch('vector_memory.cli.main.OllamaEmbeddingService')
-    @patch('vector_memory.cli.main.QdrantVectorStore')
+    @patch('vector_memory.cli.main.make_vector_store')
     @patch('vector_memory.cli.main.dispatch_commands')
-    def test_run_exception_handling(self, mock_dispatch, mock_store_class, mock_emb_class):
+    def test_run_exception_handling(self, mock_dispatch, mock_store_class, mock_emb_class, capsys):
         """Test CLI exception handling."""
         mock_emb_class.return_value = Mock()
         mock_store_class.return_value = Mock()
         mock_dispatch.side_effect = RuntimeError("Test error")
 
-        with patch('builtins.print') as mock_print:
-            result = run(["query", "--q", "test"])
+        result = run(["query", "--q", "test"])
 
         assert result == 3
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         error_data = json.loads(call_args)
         assert error_data["status"] == "error"
         assert "RuntimeError: Test error" in error_data["error"]
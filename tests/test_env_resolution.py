@@ -87,11 +87,62 @@ KEY_WITH_SPACES = spaced value
         finally:
             temp_path.unlink()
 
+    def test_parse_reparses_on_size_change_with_same_mtime(self):
+        """Test a rewrite that keeps the mtime but changes the size invalidates the cache."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
+            f.write("KEY=one\n")
+            temp_path = Path(f.name)
+
+        try:
+            st = temp_path.stat()
+            assert _parse_dotenv(temp_path) == {'KEY': 'one'}
+            temp_path.write_text("KEY=three\n")
+            os.utime(temp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            assert _parse_dotenv(temp_path) == {'KEY': 'three'}
+        finally:
+            temp_path.unlink()
+
+    def test_parse_crlf_and_equals_in_value(self):
+        """Test CRLF line endings are trimmed and only the first '=' splits key from value."""
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.env', delete=False) as f:
+            f.write(b"URL=http://h/?a=b\r\n  # KEY=commented\r\nNAME='quoted'\r\n")
+            temp_path = Path(f.name)
+
+        try:
+            assert _parse_dotenv(temp_path) == {'URL': 'http://h/?a=b', 'NAME': 'quoted'}
+        finally:
+            temp_path.unlink()
+
     def test_parse_nonexistent_file(self):
         """Test parsing nonexistent file returns empty dict."""
         result = _parse_dotenv(Path("/nonexistent/path/.env"))
         assert result == {}
 
+    def test_parse_unreadable_file(self, tmp_path):
+        """Test an unreadable .env (here a directory) is treated as absent."""
+        env_dir = tmp_path / ".env"
+        env_dir.mkdir()
+        assert _parse_dotenv(env_dir) == {}
+
+    def test_parse_cached_until_mtime_changes(self):
+        """Test repeated parses reuse the cached mapping until the file changes."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
+            f.write("KEY=one\n")
+            temp_path = Path(f.name)
+
+        try:
+            first = _parse_dotenv(temp_path)
+            with patch.object(Path, 'read_text') as mock_read:
+                assert _parse_dotenv(temp_path) is first
+                mock_read.assert_not_called()
+
+            temp_path.write_text("KEY=two\n")
+            st = temp_path.stat()
+            os.utime(temp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            assert _parse_dotenv(temp_path) == {'KEY': 'two'}
+        finally:
+            temp_path.unlink()
+
 
 class TestEnvironmentGet:
     """Test environment variable retrieval with .env fallback."""
@@ -130,6 +181,22 @@ class TestEnvironmentGet:
         assert result is None  # Should return None for whitespace-only values
 
 
+class TestConfigMemoization:
+    """Test process-level memoization of infrastructure settings."""
+
+    def test_settings_reread_after_clear_cache(self):
+        """Test settings stay fixed until clear_cache() is called."""
+        from vector_memory.infrastructure import config
+
+        with patch.dict(os.environ, {'QDRANT_URL': 'http://one:6333/', 'MEMORY_CHAT_CHUNK_CHARS': '10'}):
+            assert config.qdrant_url() == 'http://one:6333'
+            assert config.chat_chunk_chars() == 10
+            os.environ['QDRANT_URL'] = 'http://two:6333'
+            assert config.qdrant_url() == 'http://one:6333'
+            config.clear_cache()
+            assert config.qdrant_url() == 'http://two:6333'
+
+
 class TestCollectionNameResolution:
     """Test collection name resolution from explicit args or environment."""
 
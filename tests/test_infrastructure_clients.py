@@ -0,0 +1,425 @@
+"""
+Unit tests for the Ollama and Qdrant HTTP adapters.
+
+Tests request shapes and response parsing against stubbed HTTP calls.
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from vector_memory.infrastructure.ollama.client import OllamaEmbeddingService
+from vector_memory.infrastructure.qdrant.client import QdrantVectorStore
+
+
+def _json_response(obj, status_code=200):
+    """Response stub carrying ``obj`` as a raw JSON body."""
+    return Mock(status_code=status_code, content=json.dumps(obj).encode("utf-8"))
+
+
+class TestOllamaEmbeddingService:
+    """Test the Ollama embedding adapter."""
+
+    @patch('requests.Session.post')
+    def test_embed_texts_single_batched_request(self, mock_post):
+        """Test all texts are embedded with one /api/embed call."""
+        mock_post.return_value = _json_response({"embeddings": [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]})
+
+        vecs = OllamaEmbeddingService().embed_texts(["a", "b", "c"])
+
+        mock_post.assert_called_once()
+        url = mock_post.call_args[0][0]
+        body = mock_post.call_args[1]["json"]
+        assert url.endswith("/api/embed")
+        assert body["input"] == ["a", "b", "c"]
+        assert [v.values for v in vecs] == [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
+        assert all(v.dim == 2 for v in vecs)
+
+    @patch('requests.Session.post')
+    def test_embed_texts_wraps_decoded_rows(self, mock_post):
+        """Test decoded embedding rows become Vector values without a per-component copy."""
+        rows = [[0.5, 0.25]]
+        mock_post.return_value = Mock(status_code=200)
+
+        with patch('vector_memory.infrastructure.ollama.client.decode_json', return_value={"embeddings": rows}):
+            vecs = OllamaEmbeddingService().embed_texts(["a"])
+
+        assert vecs[0].values is rows[0]
+        assert vecs[0].dim == 2
+
+    @patch('requests.Session.post')
+    def test_embed_texts_empty_skips_http(self, mock_post):
+        """Test empty input performs no request."""
+        assert OllamaEmbeddingService().embed_texts([]) == []
+        mock_post.assert_not_called()
+
+    @patch('requests.Session.post')
+    def test_embed_texts_split_by_batch_size(self, mock_post, monkeypatch):
+        """Test MEMORY_EMBED_BATCH_SIZE bounds the texts per request and keeps order."""
+        monkeypatch.setenv("MEMORY_EMBED_BATCH_SIZE", "2")
+        mock_post.side_effect = lambda url, json, timeout: _json_response(
+            {"embeddings": [[float(len(t))] for t in json["input"]]}
+        )
+
+        vecs = OllamaEmbeddingService().embed_texts(["a", "bb", "ccc"])
+
+        assert [c[1]["json"]["input"] for c in mock_post.call_args_list] == [["a", "bb"], ["ccc"]]
+        assert [v.values for v in vecs] == [[1.0], [2.0], [3.0]]
+        assert all(c[1]["timeout"] >= 60 for c in mock_post.call_args_list)
+
+    @patch('requests.Session.post')
+    def test_embed_texts_legacy_fallback(self, mock_post):
+        """Test servers without /api/embed are served per text via /api/embeddings."""
+        def fake_post(url, json, timeout):
+            if url.endswith("/api/embed"):
+                return Mock(status_code=404, content=b"404 page not found")
+            return Mock(status_code=200, json=Mock(return_value={"embedding": [float(len(json["prompt"]))]}))
+        mock_post.side_effect = fake_post
+
+        vecs = OllamaEmbeddingService().embed_texts(["a", "bb"])
+
+        assert [v.values for v in vecs] == [[1.0], [2.0]]
+        assert [c[0][0].rsplit("/", 1)[1] for c in mock_post.call_args_list] == ["embed", "embeddings", "embeddings"]
+
+    @patch('requests.Session.post')
+    def test_embed_texts_unknown_model_not_retried_on_legacy(self, mock_post):
+        """Test Ollama's JSON 404 for a missing model is raised instead of falling back."""
+        import requests
+
+        response = _json_response({"error": 'model "typo" not found, try pulling it first'}, status_code=404)
+        response.raise_for_status.side_effect = requests.HTTPError("404 Client Error")
+        mock_post.return_value = response
+
+        with pytest.raises(requests.HTTPError):
+            OllamaEmbeddingService().embed_texts(["a"])
+        assert mock_post.call_count == 1
+
+    @patch('requests.Session.post')
+    def test_get_dimension_probes_once(self, mock_post, monkeypatch):
+        """Test the dimension is probed once per model and then served from cache."""
+        from vector_memory.infrastructure.ollama import client
+
+        monkeypatch.setattr(client, "_DIM_CACHE", {})
+        mock_post.return_value = _json_response({"embeddings": [[0.0, 0.0, 0.0]]})
+        svc = OllamaEmbeddingService()
+
+        assert svc.get_dimension() == 3
+        assert OllamaEmbeddingService().get_dimension() == 3
+        assert mock_post.call_count == 1
+
+        monkeypatch.setenv("EMBED_MODEL", "other-model")
+        from vector_memory.infrastructure.config import clear_cache
+        clear_cache()
+        mock_post.return_value = _json_response({"embeddings": [[0.0, 0.0]]})
+        assert svc.get_dimension() == 2
+        assert mock_post.call_count == 2
+
+
+class TestHttpSession:
+    """Test the shared keep-alive HTTP session."""
+
+    def test_session_is_shared_and_pooled(self):
+        """Test one pooled session is reused across calls."""
+        from vector_memory.infrastructure.http import http_session
+
+        session = http_session()
+
+        assert http_session() is session
+        adapter = session.get_adapter("http://localhost:6333/collections")
+        assert adapter._pool_maxsize == 16
+        assert adapter.max_retries.total == 2
+
+
+class TestQdrantVectorStore:
+    """Test the Qdrant REST adapter."""
+
+    @patch('requests.Session.get')
+    def test_collection_exists_parses_result(self, mock_get):
+        """Test the exists endpoint result is returned as a bool."""
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = {"result": {"exists": False}}
+        mock_get.return_value = mock_response
+
+        assert QdrantVectorStore().collection_exists("c") is False
+        assert mock_get.call_args[0][0].endswith("/collections/c/exists")
+
+    @patch('requests.Session.get')
+    def test_collection_exists_unknown_on_old_server(self, mock_get):
+        """Test a 404 from servers without the endpoint yields None."""
+        mock_get.return_value = Mock(status_code=404)
+
+        assert QdrantVectorStore().collection_exists("c") is None
+
+    @patch('requests.Session.get')
+    def test_list_collections_info_fans_out_and_caches(self, mock_get, monkeypatch):
+        """Test dims are fetched per collection once, then served from the short-lived cache."""
+        from vector_memory.infrastructure.qdrant import client
+        from vector_memory.infrastructure.ttl_cache import TTLCache
+
+        monkeypatch.setattr(client, "_INFO_CACHE", TTLCache(5.0))
+
+        def fake_get(url, timeout):
+            if url.endswith("/collections"):
+                r = Mock(status_code=200)
+                r.json.return_value = {"result": {"collections": [{"name": "a"}, {"name": "bb"}, {"name": "gone"}]}}
+                return r
+            name = url.rsplit("/", 1)[1]
+            if name == "gone":
+                return Mock(status_code=404)
+            r = Mock(status_code=200)
+            r.json.return_value = {"result": {"config": {"params": {"vectors": {"size": len(name)}}}}}
+            return r
+        mock_get.side_effect = fake_get
+        store = QdrantVectorStore()
+
+        info = store.list_collections_info()
+        info[0]["dim"] = 99
+        again = store.list_collections_info()
+
+        assert again == [{"name": "a", "dim": 1}, {"name": "bb", "dim": 2}, {"name": "gone", "dim": None}]
+        assert mock_get.call_count == 4
+
+        monkeypatch.setattr(client._INFO_CACHE, "ttl_s", 0.0)
+        store.list_collections_info()
+        assert mock_get.call_count == 8
+
+    @pytest.mark.parametrize("enabled,m,threshold", [(True, 0, 0), (False, 16, 20000)])
+    @patch('requests.Session.patch')
+    def test_set_bulk_load(self, mock_patch, enabled, m, threshold):
+        """Test bulk-load mode toggles HNSW m and the indexing threshold on the collection."""
+        QdrantVectorStore().set_bulk_load("c", enabled)
+
+        assert mock_patch.call_args[0][0].endswith("/collections/c")
+        assert mock_patch.call_args[1]["json"] == {
+            "hnsw_config": {"m": m}, "optimizers_config": {"indexing_threshold": threshold},
+        }
+
+    @patch('requests.Session.get')
+    def test_points_count(self, mock_get):
+        """Test the point count is read from collection info and a missing collection yields None."""
+        mock_get.return_value = _json_response({"result": {"points_count": 0, "status": "green"}})
+        assert QdrantVectorStore().points_count("c") == 0
+
+        mock_get.return_value = Mock(status_code=404)
+        assert QdrantVectorStore().points_count("c") is None
+
+    @patch('requests.Session.put')
+    def test_upsert_points_batched(self, mock_put, monkeypatch):
+        """Test points are split into MEMORY_UPSERT_BATCH_SIZE batches, each sent once."""
+        from vector_memory.domain.models import Point, Vector
+
+        monkeypatch.setenv("MEMORY_UPSERT_BATCH_SIZE", "2")
+        mock_put.side_effect = lambda url, data, headers, timeout: _json_response(
+            {"status": "ok", "result": {"status": "completed"}, "time": 0.5}
+        )
+        points = [Point(id=str(i), vector=Vector(values=[0.0], dim=1), payload={}) for i in range(5)]
+
+        raw = QdrantVectorStore().upsert_points("c", points)
+
+        sent = sorted(p["id"] for c in mock_put.call_args_list for p in json.loads(c[1]["data"])["points"])
+        assert sent == ["0", "1", "2", "3", "4"]
+        assert mock_put.call_count == 3
+        assert all(c[0][0].endswith("/collections/c/points?wait=true") for c in mock_put.call_args_list)
+        assert raw["status"] == "ok" and raw["time"] == 1.5
+
+    @patch('requests.Session.post')
+    def test_search_sends_encoded_body(self, mock_post, monkeypatch):
+        """Test search posts a pre-encoded JSON body and parses hits from the raw response."""
+        from vector_memory.domain.models import Vector
+
+        monkeypatch.setenv("VM_THREAD_FILTER", "0")
+        mock_post.return_value = _json_response({"result": [{"id": 7, "score": 0.5, "payload": {"a": 1}}]})
+
+        hits = QdrantVectorStore().search("c", Vector(values=[0.25, 0.5], dim=2), limit=3, score_threshold=0.1)
+
+        kwargs = mock_post.call_args[1]
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert json.loads(kwargs["data"]) == {
+            "vector": [0.25, 0.5], "limit": 3, "with_vector": False, "with_payload": True, "score_threshold": 0.1,
+        }
+        assert [(h.id, h.score, h.payload) for h in hits] == [("7", 0.5, {"a": 1})]
+
+
+class TestJsonCodec:
+    """Test the shared HTTP JSON codec with and without orjson."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_round_trip(self, use_orjson):
+        """Test encoded bodies decode back to the same structure."""
+        from vector_memory.infrastructure import http
+
+        backend = http.orjson if use_orjson else None
+        with patch.object(http, "orjson", backend):
+            body = http.encode_json({"points": [{"id": "x", "vector": [0.5, -1.25]}]})
+            assert http.decode_json(Mock(content=body)) == {"points": [{"id": "x", "vector": [0.5, -1.25]}]}
+            assert http.decode_json(Mock(content=b"")) is None
+
+    def test_thread_lock_parsed_once_until_changed(self, tmp_path, monkeypatch):
+        """Test the lock file is re-parsed only when its mtime or size changes."""
+        import os
+        from vector_memory.infrastructure.qdrant import client
+
+        lock = tmp_path / "current_thread.lock"
+        lock.write_text('THREAD_ID="t-1"\n')
+        monkeypatch.setenv("VM_THREAD_FILTER", "1")
+        monkeypatch.setenv("VM_THREAD_LOCK_FILE", str(lock))
+        monkeypatch.setattr(client, "_LOCK_CACHE", {})
+        parse = Mock(wraps=client._parse_shell_kv_file)
+        monkeypatch.setattr(client, "_parse_shell_kv_file", parse)
+
+        assert client._load_thread_id_from_lock() == "t-1"
+        assert client._load_thread_id_from_lock() == "t-1"
+        assert parse.call_count == 1
+
+        lock.write_text('THREAD_ID="t-22"\n')
+        os.utime(lock, ns=(0, 0))
+        assert client._load_thread_id_from_lock() == "t-22"
+        assert parse.call_count == 2
+
+        lock.unlink()
+        assert client._load_thread_id_from_lock() is None
+
+    def test_lock_file_kv_parsing(self, tmp_path):
+        """Test the lock parser skips comments/blank lines and unquotes values."""
+        from vector_memory.infrastructure.qdrant.client import _parse_shell_kv_file
+
+        lock = tmp_path / "current_thread.lock"
+        lock.write_bytes(b"# pinned\r\nTHREAD_DIR=/a/b=c\r\n\r\n THREAD_ID = \"t-1\" \r\n=orphan\r\nLOCKED_AT='17'\r\n")
+
+        assert _parse_shell_kv_file(lock) == {"THREAD_DIR": "/a/b=c", "THREAD_ID": "t-1", "LOCKED_AT": "17"}
+        assert _parse_shell_kv_file(tmp_path / "missing.lock") == {}
+
+    @pytest.mark.parametrize("mode,quantized", [("int8", True), ("", False)])
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
+    def test_ensure_collection_quantization(self, mock_get, mock_put, mode, quantized, monkeypatch):
+        """Test MEMORY_QUANTIZE=int8 requests scalar quantization for new collections only when set."""
+        monkeypatch.setenv("MEMORY_QUANTIZE", mode)
+        mock_get.return_value = Mock(status_code=404)
+
+        QdrantVectorStore().ensure_collection("c", 4)
+
+        body = mock_put.call_args[1]["json"]
+        assert body["vectors"] == {"size": 4, "distance": "Cosine"}
+        assert ("quantization_config" in body) is quantized
+        if quantized:
+            assert body["quantization_config"]["scalar"]["type"] == "int8"
+
+
+class TestQdrantGrpcVectorStore:
+    """Test the optional gRPC adapter against a stubbed qdrant-client."""
+
+    @pytest.fixture
+    def grpc(self, monkeypatch):
+        from vector_memory.infrastructure.qdrant import grpc_client
+
+        client = Mock()
+        monkeypatch.setattr(grpc_client, "QdrantClient", Mock(return_value=client))
+        monkeypatch.setattr(grpc_client, "qm", Mock())
+        grpc_client._grpc_client.cache_clear()
+        yield grpc_client, client
+        grpc_client._grpc_client.cache_clear()
+
+    def test_requires_qdrant_client(self, monkeypatch):
+        """Test a clear error is raised when qdrant-client is not installed."""
+        from vector_memory.infrastructure.qdrant import grpc_client
+
+        monkeypatch.setattr(grpc_client, "QdrantClient", None)
+        with pytest.raises(RuntimeError, match="qdrant-client"):
+            grpc_client.QdrantGrpcVectorStore()
+
+    def test_client_prefers_grpc_and_is_shared(self, grpc, monkeypatch):
+        """Test one gRPC-preferring client is built per endpoint."""
+        grpc_client, client = grpc
+        monkeypatch.setenv("QDRANT_GRPC_PORT", "7334")
+
+        first = grpc_client.QdrantGrpcVectorStore()
+        second = grpc_client.QdrantGrpcVectorStore()
+
+        assert first._client is second._client is client
+        grpc_client.QdrantClient.assert_called_once()
+        kwargs = grpc_client.QdrantClient.call_args[1]
+        assert kwargs["prefer_grpc"] is True and kwargs["grpc_port"] == 7334
+
+    def test_upsert_and_search(self, grpc, monkeypatch):
+        """Test points are sent as PointStructs and scored points map to QueryResults."""
+        from vector_memory.domain.models import Point, Vector
+
+        grpc_client, client = grpc
+        monkeypatch.setenv("VM_THREAD_FILTER", "0")
+        client.upsert.return_value = Mock(operation_id=3, status=Mock(value="completed"))
+        client.query_points.return_value = Mock(points=[Mock(id=7, score=0.5, payload={"a": 1})])
+        store = grpc_client.QdrantGrpcVectorStore()
+
+        raw = store.upsert_points("c", [Point(id="p", vector=Vector(values=[0.5], dim=1), payload={"x": 1})])
+        hits = store.search("c", Vector(values=[0.5], dim=1), limit=2, score_threshold=0.1)
+
+        grpc_client.qm.PointStruct.assert_called_once_with(id="p", vector=[0.5], payload={"x": 1})
+        assert client.upsert.call_args[1]["wait"] is True
+        assert raw == {"status": "ok", "result": {"operation_id": 3, "status": "completed"}}
+        kwargs = client.query_points.call_args[1]
+        assert kwargs["query"] == [0.5] and kwargs["limit"] == 2 and kwargs["query_filter"] is None
+        assert [(h.id, h.score, h.payload) for h in hits] == [("7", 0.5, {"a": 1})]
+
+    def test_delete_points(self, grpc):
+        """Test deletes send a PointIdsList selector and wait for completion."""
+        grpc_client, client = grpc
+        client.delete.return_value = Mock(operation_id=4, status="completed")
+
+        raw = grpc_client.QdrantGrpcVectorStore().delete_points("c", ["a", "b"])
+
+        grpc_client.qm.PointIdsList.assert_called_once_with(points=["a", "b"])
+        assert client.delete.call_args[1]["wait"] is True
+        assert raw == {"status": "ok", "result": {"operation_id": 4, "status": "completed"}}
+
+    def test_ensure_collection_size_mismatch(self, grpc):
+        """Test an existing collection with another size is rejected unless recreate is set."""
+        grpc_client, client = grpc
+        client.collection_exists.return_value = True
+        client.get_collection.return_value.config.params.vectors.size = 8
+        store = grpc_client.QdrantGrpcVectorStore()
+
+        with pytest.raises(ValueError):
+            store.ensure_collection("c", 4)
+        store.ensure_collection("c", 4, recreate=True)
+
+        client.delete_collection.assert_called_once_with("c")
+        client.create_collection.assert_called_once()
+
+    def test_factory_selects_transport(self, monkeypatch):
+        """Test the factory builds the REST adapter by default and the gRPC one when configured."""
+        from vector_memory.infrastructure.qdrant.factory import make_vector_store
+
+        assert isinstance(make_vector_store(), QdrantVectorStore)
+        monkeypatch.setenv("MEMORY_QDRANT_TRANSPORT", "grpc")
+        from vector_memory.infrastructure.config import clear_cache
+        clear_cache()
+        with patch('vector_memory.infrastructure.qdrant.grpc_client.QdrantGrpcVectorStore') as grpc_cls:
+            assert make_vector_store() is grpc_cls.return_value
+
+    def test_missing_collection_error_detection(self):
+        """Test only Qdrant's collection-not-found is classified as missing, on either transport."""
+        import requests
+        from vector_memory.infrastructure.qdrant.factory import is_missing_collection_error
+
+        def http_error(status, url):
+            response = requests.Response()
+            response.status_code = status
+            response.url = url
+            return requests.HTTPError(response=response)
+
+        class RpcError(Exception):
+            def __init__(self, name):
+                self._code = Mock()
+                self._code.name = name
+
+            def code(self):
+                return self._code
+
+        assert is_missing_collection_error(http_error(404, "http://q:6333/collections/c/points/search"))
+        assert not is_missing_collection_error(http_error(404, "http://o:11434/api/embed"))
+        assert not is_missing_collection_error(http_error(500, "http://q:6333/collections/c/points/search"))
+        assert is_missing_collection_error(RpcError("NOT_FOUND"))
+        assert not is_missing_collection_error(RpcError("DEADLINE_EXCEEDED"))
+        assert not is_missing_collection_error(TimeoutError("slow"))
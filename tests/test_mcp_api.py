@@ -0,0 +1,463 @@
+"""
+Unit tests for the programmatic MCP API surface.
+
+Tests env/.env resolution and the entry points against mocked adapters.
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from vector_memory.mcp import api
+
+
+def _http_error(status: int, url: str):
+    """requests.HTTPError as raised by raise_for_status() for ``url``."""
+    import requests
+
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    return requests.HTTPError(f"{status} Client Error", response=response)
+
+
+class TestDotenvCache:
+    """Test .env parsing is cached per file state."""
+
+    def test_parse_cached_until_file_changes(self, tmp_path, monkeypatch):
+        """Test repeated parses reuse the mapping until the file's mtime or size changes."""
+        monkeypatch.setattr(api, "_DOTENV_CACHE", {})
+        env = tmp_path / ".env"
+        env.write_text("MEMORY_COLLECTION_NAME='primary'\n# MEMORY_COLLECTION_NAME_2=x\n")
+
+        first = api._parse_dotenv(env)
+        with patch.object(Path, "read_text") as mock_read:
+            assert api._parse_dotenv(env) is first
+            mock_read.assert_not_called()
+        assert first == {"MEMORY_COLLECTION_NAME": "primary"}
+
+        env.write_text("MEMORY_COLLECTION_NAME=other\n")
+        st = env.stat()
+        os.utime(env, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert api._parse_dotenv(env) == {"MEMORY_COLLECTION_NAME": "other"}
+        assert api._parse_dotenv(tmp_path / "missing.env") == {}
+
+    def test_parse_crlf_comments_and_equals_in_value(self, tmp_path, monkeypatch):
+        """Test CRLF endings, comments, blank keys and '=' inside values parse like the CLI."""
+        monkeypatch.setattr(api, "_DOTENV_CACHE", {})
+        env = tmp_path / ".env"
+        env.write_bytes(b"URL=http://h/?a=b\r\n  # KEY=commented\r\n\r\n=orphan\r\n NAME = 'quoted' \r\n")
+
+        assert api._parse_dotenv(env) == {"URL": "http://h/?a=b", "NAME": "quoted"}
+
+    def test_unreadable_dotenv_treated_as_absent(self, tmp_path, monkeypatch):
+        """Test a .env that cannot be read (here a directory) yields no values and is not cached."""
+        monkeypatch.setattr(api, "_DOTENV_CACHE", {})
+        (tmp_path / ".env").mkdir()
+
+        assert api._parse_dotenv(tmp_path / ".env") == {}
+        assert api._DOTENV_CACHE == {}
+
+    def test_missing_dotenv_not_restatted_within_ttl(self, tmp_path, monkeypatch):
+        """Test a missing .env is remembered briefly, then noticed once it appears."""
+        monkeypatch.setattr(api, "_DOTENV_CACHE", {})
+        monkeypatch.setattr(api, "_DOTENV_MISSING", {})
+        env = tmp_path / ".env"
+
+        assert api._parse_dotenv(env) == {}
+        env.write_text("KEY=v\n")
+        with patch.object(Path, "stat") as mock_stat:
+            assert api._parse_dotenv(env) == {}
+            mock_stat.assert_not_called()
+
+        api._DOTENV_MISSING.clear()  # TTL elapsed
+        assert api._parse_dotenv(env) == {"KEY": "v"}
+
+
+class TestSharedAdapters:
+    """Test MCP entry points reuse one adapter pair per process."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_adapters(self, monkeypatch):
+        monkeypatch.setattr(api, "_EMB", None)
+        monkeypatch.setattr(api, "_STORE", None)
+
+    @patch("vector_memory.mcp.api.UpsertMemoryUseCase")
+    @patch("vector_memory.mcp.api.iter_memory_items", return_value=[])
+    @patch("vector_memory.mcp.api.make_vector_store")
+    @patch("vector_memory.mcp.api.OllamaEmbeddingService")
+    def test_adapters_built_once(self, mock_emb_cls, mock_store_cls, mock_loader, mock_use_case_cls):
+        """Test repeated calls construct the embedding and store adapters only once."""
+        mock_use_case_cls.return_value.execute.return_value.raw = {"status": "ok"}
+
+        assert api.vector_index_memory_bank("c") == {"status": "ok"}
+        assert api.vector_index_memory_bank("c") == {"status": "ok"}
+
+        mock_emb_cls.assert_called_once_with()
+        mock_store_cls.assert_called_once_with()
+        for c in mock_use_case_cls.call_args_list:
+            assert c[0] == (mock_emb_cls.return_value, mock_store_cls.return_value)
+
+
+class TestQueryCaching:
+    """Test query embedding reuse and the opt-in semantic result cache."""
+
+    @pytest.fixture
+    def adapters(self, monkeypatch):
+        from vector_memory.application.embedding_cache import EmbeddingCache
+        from vector_memory.application.use_cases import query_memory
+        from vector_memory.domain.models import QueryResult, Vector
+
+        emb, store = Mock(), Mock()
+        vectors = {"alpha": [1.0, 0.0], "alpha!": [0.999, 0.01], "beta": [0.0, 1.0]}
+        emb.embed_texts.side_effect = lambda texts: [Vector(values=vectors[t], dim=2) for t in texts]
+        store.search.return_value = [QueryResult(id="1", score=0.9, payload={"a": 1})]
+        monkeypatch.setattr(api, "_EMB", emb)
+        monkeypatch.setattr(api, "_STORE", store)
+        monkeypatch.setattr(api, "_list_qdrant_collections", lambda: ["c"])
+        monkeypatch.setattr(query_memory, "shared_embedding_cache", lambda: cache)
+        monkeypatch.setenv("VM_THREAD_FILTER", "0")
+        cache = EmbeddingCache(16)
+        api._semcache_clear()
+        yield emb, store
+        api._semcache_clear()
+
+    def test_repeated_query_embedded_once(self, adapters):
+        """Test an identical query string is embedded once while every call still searches."""
+        emb, store = adapters
+
+        first = api.vector_query("c", "alpha")
+        second = api.vector_query("c", "alpha")
+
+        assert first == second
+        assert first["result"] == [{"id": "1", "score": 0.9, "payload": {"a": 1}}]
+        emb.embed_texts.assert_called_once_with(["alpha"])
+        assert store.search.call_count == 2
+
+    def test_semantic_cache_reuses_similar_results(self, adapters, monkeypatch):
+        """Test near-identical queries reuse results above the threshold and writes invalidate them."""
+        emb, store = adapters
+        monkeypatch.setenv("MEMORY_SEMCACHE_THRESHOLD", "0.97")
+
+        api.vector_query("c", "alpha")
+        api.vector_query("c", "alpha!")
+        assert store.search.call_count == 1
+
+        api.vector_query("c", "beta")
+        api.vector_query("c", "alpha", k=3)
+        assert store.search.call_count == 3
+
+        with patch("vector_memory.mcp.api.http_session") as mock_session:
+            mock_session.return_value.post.return_value.json.return_value = {"status": "ok"}
+            api.vector_delete("c", ["1"])
+        api.vector_query("c", "alpha")
+        assert store.search.call_count == 4
+
+    def test_semantic_cache_expires_and_is_scoped(self, adapters, monkeypatch):
+        """Test cached results expire after the TTL and are not shared across Qdrant URLs or models."""
+        from vector_memory.infrastructure import config
+
+        _, store = adapters
+        monkeypatch.setenv("MEMORY_SEMCACHE_THRESHOLD", "0.97")
+        now = [1000.0]
+        monkeypatch.setattr(api.time, "monotonic", lambda: now[0])
+
+        api.vector_query("c", "alpha")
+        now[0] += api._SEMCACHE_TTL_S
+        api.vector_query("c", "alpha")
+        assert store.search.call_count == 2
+
+        monkeypatch.setenv("QDRANT_URL", "http://other:6333")
+        config.qdrant_url.cache_clear()
+        api.vector_query("c", "alpha")
+        monkeypatch.setenv("EMBED_MODEL", "other-model")
+        config.embed_model.cache_clear()
+        api.vector_query("c", "alpha")
+        assert store.search.call_count == 4
+
+    def test_results_are_fresh_mappings(self, adapters):
+        """Test serialized matches are new dicts, so callers cannot mutate the store's results."""
+        _, store = adapters
+        match = store.search.return_value[0]
+
+        row = api.vector_query("c", "alpha")["result"][0]
+        row["score"] = 0.0
+
+        assert row is not match.__dict__
+        assert match.score == 0.9
+
+
+class TestQueryPrecheck:
+    """Test vector_query only lists collections when the query itself fails."""
+
+    @pytest.fixture(autouse=True)
+    def adapters(self, monkeypatch):
+        monkeypatch.setattr(api, "_EMB", Mock())
+        monkeypatch.setattr(api, "_STORE", Mock())
+
+    @patch("vector_memory.mcp.api.list_collections")
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_happy_path_skips_listing(self, mock_use_case_cls, mock_list):
+        """Test a successful query issues no collection listing."""
+        mock_use_case_cls.return_value.execute.return_value = []
+
+        assert api.vector_query("c", "q") == {"status": "ok", "collection": "c", "result": []}
+        mock_list.assert_not_called()
+
+    @patch("vector_memory.mcp.api.list_collections", return_value=["a", "b"])
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_missing_collection_reports_available(self, mock_use_case_cls, mock_list):
+        """Test a 404 from Qdrant lists names once; repeats are answered from the listing without embedding."""
+        execute = mock_use_case_cls.return_value.execute
+        execute.side_effect = _http_error(404, "http://localhost:6333/collections/c/points/search")
+
+        out = api.vector_query("c", "q")
+        again = api.vector_query("c", "q")
+
+        assert out["status"] == "error" and out["available_collections"] == ["a", "b"]
+        assert again == out
+        assert execute.call_count == 1
+        mock_list.assert_called_once()
+
+    @patch("vector_memory.mcp.api.list_collections")
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_embedding_errors_propagate_without_listing(self, mock_use_case_cls, mock_list):
+        """Test Ollama failures (including its 404 for unknown models) are re-raised untouched."""
+        mock_use_case_cls.return_value.execute.side_effect = _http_error(404, "http://localhost:11434/api/embed")
+
+        with pytest.raises(Exception, match="404"):
+            api.vector_query("c", "q")
+        mock_list.assert_not_called()
+
+    @patch("vector_memory.mcp.api.list_collections", return_value=["c"])
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_failure_on_existing_collection_propagates(self, mock_use_case_cls, mock_list):
+        """Test a 404 for a collection the listing still shows is not masked."""
+        mock_use_case_cls.return_value.execute.side_effect = _http_error(404, "http://localhost:6333/collections/c/points/search")
+
+        with pytest.raises(Exception, match="404"):
+            api.vector_query("c", "q")
+        mock_list.assert_called_once()
+
+
+class TestEmptyCollectionShortcut:
+    """Test queries against empty collections skip embedding and search once known empty."""
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        from vector_memory.infrastructure.ttl_cache import TTLCache
+
+        store = Mock()
+        monkeypatch.setattr(api, "_EMB", Mock())
+        monkeypatch.setattr(api, "_STORE", store)
+        monkeypatch.setattr(api, "_EMPTY", TTLCache(5.0))
+        return store
+
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_count_only_after_empty_search(self, mock_use_case_cls, store):
+        """Test non-empty results never count points; an empty result on an empty collection is remembered."""
+        from vector_memory.domain.models import QueryResult
+
+        execute = mock_use_case_cls.return_value.execute
+        execute.return_value = [QueryResult(id="1", score=0.9, payload={})]
+        api.vector_query("c", "q")
+        store.points_count.assert_not_called()
+
+        execute.return_value = []
+        store.points_count.return_value = 0
+        assert api.vector_query("c", "q") == {"status": "ok", "collection": "c", "result": []}
+        assert api.vector_query("c", "q") == {"status": "ok", "collection": "c", "result": []}
+        assert execute.call_count == 2
+        store.points_count.assert_called_once_with("c")
+
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_filtered_empty_result_not_remembered(self, mock_use_case_cls, store):
+        """Test an empty result from a non-empty collection (threshold, thread filter) keeps searching."""
+        mock_use_case_cls.return_value.execute.return_value = []
+        store.points_count.return_value = 3
+
+        api.vector_query("c", "q")
+        api.vector_query("c", "q")
+
+        assert mock_use_case_cls.return_value.execute.call_count == 2
+
+    @patch("vector_memory.mcp.api.EnsureCollectionUseCase")
+    @patch("vector_memory.mcp.api.QueryMemoryUseCase")
+    def test_writes_forget_emptiness(self, mock_use_case_cls, mock_ensure_cls, store, monkeypatch):
+        """Test recreate and delete through the API drop the remembered empty state."""
+        monkeypatch.setattr(api, "_ENSURED", {})
+        monkeypatch.setattr(api, "_allowed_collections", lambda: ["c"])
+        api._get_emb().get_dimension.return_value = 4
+        mock_use_case_cls.return_value.execute.return_value = []
+        store.points_count.return_value = 0
+
+        api.vector_query("c", "q")
+        assert api._known_empty("c")
+        api.vector_create_collection("c", recreate=True)
+        assert not api._known_empty("c")
+
+        api.vector_query("c", "q")
+        with patch("vector_memory.mcp.api.http_session") as mock_session:
+            mock_session.return_value.post.return_value.json.return_value = {"status": "ok"}
+            api.vector_delete("c", ["1"])
+        assert not api._known_empty("c")
+
+
+class TestIndexMemoryBank:
+    """Test memory-bank ingestion through the MCP API."""
+
+    @patch("vector_memory.mcp.api.UpsertMemoryUseCase")
+    @patch("vector_memory.mcp.api.iter_memory_items")
+    def test_large_ingest_upserted_in_concurrent_batches(self, mock_loader, mock_use_case_cls, monkeypatch):
+        """Test items are split into embed-sized batches, all sent, with provider times summed."""
+        from vector_memory.domain.models import MemoryItem
+
+        monkeypatch.setenv("MEMORY_EMBED_BATCH_SIZE", "2")
+        monkeypatch.setattr(api, "_EMB", Mock())
+        monkeypatch.setattr(api, "_STORE", Mock())
+        mock_loader.return_value = [MemoryItem(text=str(i), meta={}) for i in range(5)]
+        mock_use_case_cls.return_value.execute.side_effect = lambda req: Mock(raw={"status": "ok", "time": 0.5})
+
+        raw = api.vector_index_memory_bank("c")
+
+        sent = sorted(it.text for c in mock_use_case_cls.return_value.execute.call_args_list for it in c[0][0].items)
+        assert sent == ["0", "1", "2", "3", "4"]
+        assert mock_use_case_cls.return_value.execute.call_count == 3
+        assert raw == {"status": "ok", "time": 1.5}
+
+    @patch("vector_memory.mcp.api.UpsertMemoryUseCase")
+    @patch("vector_memory.mcp.api.iter_memory_items")
+    def test_max_items_stops_reading(self, mock_iter, mock_use_case_cls, monkeypatch):
+        """Test ingestion pulls items lazily, so files past max_items are never read."""
+        from vector_memory.domain.models import MemoryItem
+
+        pulled = []
+
+        def gen(_root):
+            for i in range(10):
+                pulled.append(i)
+                yield MemoryItem(text=str(i), meta={})
+
+        monkeypatch.setattr(api, "_EMB", Mock())
+        monkeypatch.setattr(api, "_STORE", Mock())
+        mock_iter.side_effect = gen
+        mock_use_case_cls.return_value.execute.return_value = Mock(raw={"status": "ok"})
+
+        assert api.vector_index_memory_bank("c", max_items=3) == {"status": "ok"}
+        assert pulled == [0, 1, 2]
+        assert [it.text for it in mock_use_case_cls.return_value.execute.call_args[0][0].items] == ["0", "1", "2"]
+
+
+class TestGrpcTransport:
+    """Test MCP listing and deletes go through the gRPC adapter when selected."""
+
+    def test_list_and_delete_use_store(self, monkeypatch):
+        """Test MEMORY_QDRANT_TRANSPORT=grpc routes listing and deletes to the shared adapter."""
+        store = Mock()
+        store.list_collections.return_value = ["b", "a", "b"]
+        store.delete_points.return_value = {"status": "ok", "result": {"operation_id": 1, "status": "completed"}}
+        monkeypatch.setattr(api, "_STORE", store)
+        monkeypatch.setenv("MEMORY_QDRANT_TRANSPORT", "grpc")
+
+        with patch("vector_memory.mcp.api.http_session") as mock_session:
+            assert api._list_qdrant_collections() == ["a", "b"]
+            assert api.vector_delete("a", ("1",))["status"] == "ok"
+
+        store.delete_points.assert_called_once_with("a", ["1"])
+        mock_session.assert_not_called()
+
+
+class TestCollectionAllowlist:
+    """Test the env/.env collection allowlist."""
+
+    def test_allowed_collections_deduplicated_in_order(self, tmp_path, monkeypatch):
+        """Test primary comes first, env overrides .env, and duplicates/blanks are dropped."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".env").write_text(
+            "MEMORY_COLLECTION_NAME=main\nMEMORY_COLLECTION_NAME_2=two\nMEMORY_COLLECTION_NAME_3=stale\n"
+        )
+        for k in [k for k in os.environ if k.startswith("MEMORY_COLLECTION_NAME")]:
+            monkeypatch.delenv(k)
+        monkeypatch.setenv("MEMORY_COLLECTION_NAME_3", " main ")
+        monkeypatch.setenv("MEMORY_COLLECTION_NAME_4", "four")
+        monkeypatch.setenv("MEMORY_COLLECTION_NAME_5", "  ")
+
+        assert api._list_additional_collections() == ["two", "main", "four"]
+        assert api._allowed_collections() == ["main", "two", "four"]
+
+
+class TestCreateCollection:
+    """Test the allowlisted ensure entry point."""
+
+    @patch("vector_memory.mcp.api.EnsureCollectionUseCase")
+    def test_repeat_ensure_skips_qdrant_until_ttl_or_recreate(self, mock_use_case_cls, monkeypatch):
+        """Test a repeated ensure is answered locally; recreate and TTL expiry go back to Qdrant."""
+        emb = Mock()
+        emb.get_dimension.return_value = 8
+        monkeypatch.setattr(api, "_EMB", emb)
+        monkeypatch.setattr(api, "_STORE", Mock())
+        monkeypatch.setattr(api, "_ENSURED", {})
+        monkeypatch.setattr(api, "_allowed_collections", lambda: ["c"])
+        expected = {"status": "ok", "collection": "c", "dimension": 8, "distance": "Cosine"}
+
+        assert api.vector_create_collection("c") == expected
+        assert api.vector_create_collection("c") == expected
+        assert mock_use_case_cls.return_value.execute.call_count == 1
+
+        api.vector_create_collection("c", recreate=True)
+        assert mock_use_case_cls.return_value.execute.call_count == 2
+
+        monkeypatch.setattr(api, "_ENSURED_TTL_S", 0.0)
+        api.vector_create_collection("c")
+        assert mock_use_case_cls.return_value.execute.call_count == 3
+
+
+class TestListCollections:
+    """Test parsing of the Qdrant collection listing."""
+
+    @patch("requests.Session.get")
+    def test_raw_body_decoded_sorted_and_unique(self, mock_get):
+        """Test names are read from the raw JSON body, stripped, de-duplicated and sorted."""
+        body = {"result": {"collections": [{"name": "b"}, {"name": " a "}, {"name": "b"}, {"name": ""}, {}]}}
+        mock_get.return_value = Mock(status_code=200, content=json.dumps(body).encode("utf-8"))
+
+        assert api.list_collections("http://q", 1.0) == ["a", "b"]
+        assert mock_get.call_args[0][0] == "http://q/collections"
+
+
+class TestDelete:
+    """Test deletes by point ID."""
+
+    @patch("requests.Session.post")
+    def test_large_id_list_split_into_batches(self, mock_post, monkeypatch):
+        """Test IDs go out in MEMORY_DELETE_BATCH_SIZE batches with provider times summed."""
+        monkeypatch.setenv("MEMORY_DELETE_BATCH_SIZE", "2")
+        mock_post.return_value.json.return_value = {"status": "ok", "result": {"status": "completed"}, "time": 0.25}
+
+        out = api.vector_delete("c", (str(i) for i in range(5)))
+
+        assert [c[1]["json"]["points"] for c in mock_post.call_args_list] == [["0", "1"], ["2", "3"], ["4"]]
+        assert all(c[0][0].endswith("/collections/c/points/delete?wait=true") for c in mock_post.call_args_list)
+        assert out["status"] == "ok" and out["time"] == 0.75
+
+    @patch("vector_memory.mcp.api.EnsureCollectionUseCase")
+    def test_bulk_load_then_finalize(self, mock_use_case_cls, monkeypatch):
+        """Test bulk_load is forwarded to the use case and finalize restores indexing."""
+        store = Mock()
+        monkeypatch.setattr(api, "_EMB", Mock())
+        monkeypatch.setattr(api, "_STORE", store)
+        monkeypatch.setattr(api, "_ENSURED", {})
+        monkeypatch.setattr(api, "_allowed_collections", lambda: ["c"])
+        monkeypatch.setattr(api, "_list_qdrant_collections", lambda: ["c"])
+
+        api.vector_create_collection("c", dim=4, bulk_load=True)
+        api.vector_create_collection("c", dim=4, bulk_load=True)
+
+        assert mock_use_case_cls.return_value.execute.call_count == 2
+        assert mock_use_case_cls.return_value.execute.call_args[0][0].bulk_load is True
+        assert api.vector_finalize_collection("c") == {"status": "ok", "collection": "c"}
+        store.set_bulk_load.assert_called_once_with("c", False)
+        assert api.vector_finalize_collection("other")["status"] == "error"
@@ -11,7 +11,7 @@ from unittest.mock import Mock, patch, call
 import pytest
 from argparse import Namespace
 
-from vector_memory.cli.main import index_memory, remember_memory, store_turn, _chunk
+from vector_memory.cli.main import index_memory, remember_memory, store_turn, _chunk, _iter_chunks
 from vector_memory.domain.models import MemoryItem
 
 
@@ -44,8 +44,7 @@ class TestMemoryBankIndexing:
             max_items=None
         )
 
-        with patch('builtins.print') as mock_print:
-            result = index_memory(ns, mock_emb, mock_store)
+        result = index_memory(ns, mock_emb, mock_store)
 
         assert result == 0
         mock_loader.assert_called_once_with(Path("memory-bank"))
@@ -76,8 +75,7 @@ class TestMemoryBankIndexing:
             max_items=3
         )
 
-        with patch('builtins.print'):
-            result = index_memory(ns, Mock(), Mock())
+        result = index_memory(ns, Mock(), Mock())
 
         assert result == 0
 
@@ -104,8 +102,7 @@ class TestMemoryBankIndexing:
             mock_use_case.execute.return_value = Mock(raw={})
             mock_use_case_class.return_value = mock_use_case
 
-            with patch('builtins.print'):
-                result = index_memory(ns, Mock(), Mock())
+            result = index_memory(ns, Mock(), Mock())
 
         assert result == 0
 
@@ -113,6 +110,21 @@ class TestMemoryBankIndexing:
         request = mock_use_case.execute.call_args[0][0]
         assert len(request.items) == 0
 
+    def test_loader_reads_top_level_markdown(self, temp_memory_bank):
+        """Test the loader returns sorted top-level .md files with stable source paths."""
+        from vector_memory.ingestion.memory_bank_loader import load_memory_items
+
+        (temp_memory_bank / "crlf.md").write_bytes(b"line one\r\nline two\r\n")
+        (temp_memory_bank / "notes.txt").write_text("ignored")
+
+        items = load_memory_items(temp_memory_bank)
+
+        assert [it.meta["name"] for it in items] == ["crlf.md", "test1.md", "test2.md"]
+        assert [it.meta["source"] for it in items] == [str(temp_memory_bank / it.meta["name"]) for it in items]
+        assert items[0].text == "line one\nline two\n"  # universal newlines, as read_text() produced
+        assert items[1].meta["size_bytes"] == (temp_memory_bank / "test1.md").stat().st_size
+        assert load_memory_items(temp_memory_bank / "missing") == []
+
 
 class TestRememberCommand:
     """Test remember command functionality."""
@@ -134,8 +146,7 @@ class TestRememberCommand:
             idns="convo"
         )
 
-        with patch('builtins.print') as mock_print:
-            result = remember_memory(ns, Mock(), Mock())
+        result = remember_memory(ns, Mock(), Mock())
 
         assert result == 0
         mock_use_case.execute.assert_called_once()
@@ -156,6 +167,50 @@ class TestRememberCommand:
             assert item.meta["kind"] == "conversational"
             assert item.meta["tags"] == ["important", "project"]
 
+    @patch('vector_memory.cli.main.UpsertMemoryUseCase')
+    @patch('vector_memory.cli.main._resolve_collection_name')
+    def test_remember_concurrent_batches(self, mock_resolve, mock_use_case_class, capsys):
+        """Test large inputs are upserted in sub-batches covering every line exactly once."""
+        mock_resolve.return_value = "test_collection"
+        mock_use_case = Mock()
+        mock_use_case.execute.side_effect = lambda req: Mock(raw={"first": req.items[0].text, "time": 0.25})
+        mock_use_case_class.return_value = mock_use_case
+
+        ns = Namespace(
+            name="test_collection",
+            text=[f"memory {i}" for i in range(130)],
+            file=None,
+            tag=[],
+            idns="convo",
+            concurrency=3,
+        )
+
+        assert remember_memory(ns, Mock(), Mock()) == 0
+
+        requests = [c[0][0] for c in mock_use_case.execute.call_args_list]
+        assert sorted(len(r.items) for r in requests) == [2, 64, 64]
+        texts = sorted(it.text for r in requests for it in r.items)
+        assert texts == sorted(f"memory {i}" for i in range(130))
+        assert len({id(it.meta) for r in requests for it in r.items}) == 1  # one shared meta dict
+        output = json.loads(capsys.readouterr().out)
+        assert output["indexed"] == 130
+        # last batch's response regardless of completion order, with time summed over all batches
+        assert output["raw"] == {"first": "memory 128", "time": 0.75}
+
+    @patch('vector_memory.cli.main.UpsertMemoryUseCase')
+    @patch('vector_memory.cli.main._resolve_collection_name')
+    def test_remember_batches_follow_embed_batch_size(self, mock_resolve, mock_use_case_class, monkeypatch):
+        """Test MEMORY_EMBED_BATCH_SIZE sets the items per remember upsert request."""
+        monkeypatch.setenv("MEMORY_EMBED_BATCH_SIZE", "4")
+        mock_resolve.return_value = "test_collection"
+        mock_use_case_class.return_value.execute.return_value = Mock(raw={})
+
+        ns = Namespace(name="test_collection", text=[f"m{i}" for i in range(10)], file=None, tag=[], idns="convo", concurrency=1)
+        assert remember_memory(ns, Mock(), Mock()) == 0
+
+        sizes = [len(c[0][0].items) for c in mock_use_case_class.return_value.execute.call_args_list]
+        assert sizes == [4, 4, 2]
+
     @patch('vector_memory.cli.main.UpsertMemoryUseCase')
     @patch('vector_memory.cli.main._resolve_collection_name')
     def test_remember_from_file(self, mock_resolve, mock_use_case_class):
@@ -187,8 +242,7 @@ Third line of memories
                 idns="file"
             )
 
-            with patch('builtins.print'):
-                result = remember_memory(ns, Mock(), Mock())
+            result = remember_memory(ns, Mock(), Mock())
 
             assert result == 0
 
@@ -204,6 +258,28 @@ Third line of memories
         finally:
             temp_path.unlink()
 
+    @patch('vector_memory.cli.main.UpsertMemoryUseCase')
+    @patch('vector_memory.cli.main._resolve_collection_name')
+    def test_remember_large_file_streams_batches(self, mock_resolve, mock_use_case_class, tmp_path, capsys):
+        """Test file lines are upserted batch by batch, in order, with the total reported."""
+        mock_resolve.return_value = "test_collection"
+        mock_use_case = Mock()
+        mock_use_case.execute.side_effect = lambda req: Mock(raw={"last": req.items[-1].text})
+        mock_use_case_class.return_value = mock_use_case
+        path = tmp_path / "dump.txt"
+        path.write_text("".join(f"line {i}\n\n" for i in range(200)))
+
+        ns = Namespace(name="test_collection", text=["extra"], file=str(path), tag=[], idns="file", concurrency=1)
+
+        assert remember_memory(ns, Mock(), Mock()) == 0
+
+        sizes = [len(c[0][0].items) for c in mock_use_case.execute.call_args_list]
+        assert sizes == [64, 64, 64, 9]
+        assert mock_use_case.execute.call_args_list[0][0][0].items[0].text == "extra"
+        output = json.loads(capsys.readouterr().out)
+        assert output["indexed"] == 201
+        assert output["raw"] == {"last": "line 199", "time": 0.0}
+
     @patch('vector_memory.cli.main.UpsertMemoryUseCase')
     @patch('vector_memory.cli.main._resolve_collection_name')
     def test_remember_combined_sources(self, mock_resolve, mock_use_case_class):
@@ -227,8 +303,7 @@ Third line of memories
                 idns="combined"
             )
 
-            with patch('builtins.print'):
-                result = remember_memory(ns, Mock(), Mock())
+            result = remember_memory(ns, Mock(), Mock())
 
             assert result == 0
 
@@ -243,7 +318,7 @@ Third line of memories
             temp_path.unlink()
 
     @patch('vector_memory.cli.main._resolve_collection_name')
-    def test_remember_empty_input(self, mock_resolve):
+    def test_remember_empty_input(self, mock_resolve, capsys):
         """Test remember with no text or file produces empty result."""
         mock_resolve.return_value = "test_collection"
 
@@ -255,12 +330,11 @@ Third line of memories
             idns="empty"
         )
 
-        with patch('builtins.print') as mock_print:
-            result = remember_memory(ns, Mock(), Mock())
+        result = remember_memory(ns, Mock(), Mock())
 
         assert result == 0
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         result_data = json.loads(call_args)
         assert result_data["status"] == "ok"
         assert result_data["result"]["indexed"] == 0
@@ -283,8 +357,7 @@ Third line of memories
             mock_use_case.execute.return_value = Mock(raw={})
             mock_use_case_class.return_value = mock_use_case
 
-            with patch('builtins.print'):
-                result = remember_memory(ns, Mock(), Mock())
+            result = remember_memory(ns, Mock(), Mock())
 
         assert result == 0
 
@@ -358,6 +431,21 @@ class TestChunkingFunction:
         assert result[3] == "A" * 1
         assert "".join(result) == text
 
+    def test_iter_chunks_single_chunk_returns_same_object(self):
+        """Test text shorter than the chunk size is passed through without copying."""
+        text = "x" * 50
+
+        chunks = list(_iter_chunks(text, 100))
+
+        assert len(chunks) == 1 and chunks[0] is text
+
+    def test_iter_chunks_is_lazy(self):
+        """Test the generator yields chunks on demand with the same segmentation."""
+        gen = _iter_chunks("1234567", 3)
+
+        assert next(gen) == "123"
+        assert list(gen) == ["456", "7"]
+
 
 class TestStoreTurnIntegration:
     """Integration tests for store-turn functionality."""
@@ -392,8 +480,7 @@ class TestStoreTurnIntegration:
             chunk_chars=None
         )
 
-        with patch('builtins.print'):
-            result = store_turn(ns, Mock(), Mock())
+        result = store_turn(ns, Mock(), Mock())
 
         assert result == 0
 
@@ -440,8 +527,7 @@ class TestStoreTurnIntegration:
             chunk_chars=1000
         )
 
-        with patch('builtins.print'):
-            result = store_turn(ns, Mock(), Mock())
+        result = store_turn(ns, Mock(), Mock())
 
         assert result == 0
 
@@ -455,6 +541,30 @@ class TestStoreTurnIntegration:
         assert "model" not in item.meta  # None values filtered out
         assert "tool_calls" not in item.meta
 
+    @patch('vector_memory.cli.main._resolve_collection_name')
+    @patch('vector_memory.cli.main._list_qdrant_collections')
+    @patch('vector_memory.cli.main.UpsertMemoryUseCase')
+    def test_store_turn_upserts_in_sub_batches(self, mock_use_case_class, mock_collections, mock_resolve, capsys):
+        """Test chunks are upserted in --batch-size groups with continuous chunk indexes."""
+        mock_resolve.return_value = "test_collection"
+        mock_collections.return_value = ["test_collection"]
+        mock_use_case = Mock()
+        mock_use_case.execute.return_value = Mock(raw={})
+        mock_use_case_class.return_value = mock_use_case
+
+        ns = Namespace(
+            thread_id="t", turn_index=2, role="user", text="abcdefg",
+            files=[], idns="chat", chunk_chars=1, batch_size=3,
+        )
+
+        result = store_turn(ns, Mock(), Mock())
+
+        assert result == 0
+        batches = [c[0][0].items for c in mock_use_case.execute.call_args_list]
+        assert [len(b) for b in batches] == [3, 3, 1]
+        assert [it.meta["chunk_index"] for b in batches for it in b] == list(range(7))
+        assert json.loads(capsys.readouterr().out)["indexed_chunks"] == 7
+
     def test_store_turn_invalid_json_tool_calls(self):
         """Test store-turn handles invalid JSON in tool_calls gracefully."""
         ns = Namespace(
@@ -474,8 +584,7 @@ class TestStoreTurnIntegration:
                     mock_use_case.execute.return_value = Mock(raw={})
                     mock_use_case_class.return_value = mock_use_case
 
-                    with patch('builtins.print'):
-                        result = store_turn(ns, Mock(), Mock())
+                    result = store_turn(ns, Mock(), Mock())
 
         assert result == 0
 
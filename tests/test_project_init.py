@@ -112,7 +112,7 @@ class TestDocumentGeneration:
 class TestQdrantCollectionListing:
     """Test Qdrant collection listing functionality."""
 
-    @patch('vector_memory.cli.main.requests.get')
+    @patch('requests.Session.get')
     @patch('vector_memory.cli.main.operation_timeout')
     def test_fetch_collections_success(self, mock_timeout, mock_get):
         """Test successful collection fetching from Qdrant."""
@@ -138,7 +138,7 @@ class TestQdrantCollectionListing:
         mock_get.assert_called_once_with("http://localhost:6333/collections", timeout=30)
         mock_response.raise_for_status.assert_called_once()
 
-    @patch('vector_memory.cli.main.requests.get')
+    @patch('requests.Session.get')
     def test_fetch_collections_deduplication(self, mock_get):
         """Test collection name deduplication and sorting."""
         mock_response = Mock()
@@ -158,7 +158,7 @@ class TestQdrantCollectionListing:
 
         assert result == ["alpha_collection", "beta_collection", "zebra_collection"]
 
-    @patch('vector_memory.cli.main.requests.get')
+    @patch('requests.Session.get')
     def test_fetch_collections_filters_invalid(self, mock_get):
         """Test filtering of invalid collection entries."""
         mock_response = Mock()
@@ -180,7 +180,7 @@ class TestQdrantCollectionListing:
 
         assert result == ["another_valid", "valid_collection"]
 
-    @patch('vector_memory.cli.main.requests.get')
+    @patch('requests.Session.get')
     def test_fetch_collections_empty_response(self, mock_get):
         """Test handling of empty or malformed responses."""
         mock_response = Mock()
@@ -191,7 +191,7 @@ class TestQdrantCollectionListing:
 
         assert result == []
 
-    @patch('vector_memory.cli.main.requests.get')
+    @patch('requests.Session.get')
     def test_fetch_collections_missing_result(self, mock_get):
         """Test handling of response missing result field."""
         mock_response = Mock()
@@ -232,6 +232,37 @@ class TestQdrantCollectionListing:
 
         assert result == []  # Should return empty list on error
 
+    @patch('vector_memory.cli.main._fetch_collections')
+    @patch('vector_memory.cli.main.qdrant_url')
+    def test_list_qdrant_collections_cached_per_url(self, mock_url, mock_fetch):
+        """Test repeated listings within the TTL reuse one fetch per Qdrant URL."""
+        mock_fetch.return_value = ["collection1"]
+        mock_url.return_value = "http://a:6333"
+
+        assert _list_qdrant_collections() == ["collection1"]
+        assert _list_qdrant_collections() == ["collection1"]
+        assert mock_fetch.call_count == 1
+
+        mock_url.return_value = "http://b:6333"
+        _list_qdrant_collections()
+        assert mock_fetch.call_count == 2
+
+    @patch('vector_memory.cli.main._allowed_collections', return_value=["fresh"])
+    @patch('vector_memory.cli.main.EnsureCollectionUseCase')
+    @patch('vector_memory.cli.main._fetch_collections')
+    def test_ensure_invalidates_cached_listing(self, mock_fetch, mock_use_case, mock_allowed):
+        """Test ensure-collection drops the cached listing so the new collection is seen."""
+        from vector_memory.cli.main import _handle_ensure
+
+        mock_fetch.return_value = []
+        assert _list_qdrant_collections() == []
+
+        ns = Namespace(name="fresh", dim=8, distance="Cosine", recreate=False)
+        assert _handle_ensure(ns, Mock(), Mock()) == 0
+
+        mock_fetch.return_value = ["fresh"]
+        assert _list_qdrant_collections() == ["fresh"]
+
 
 class TestNewProjectCommand:
     """Test new-project command functionality."""
@@ -263,8 +294,7 @@ class TestNewProjectCommand:
                 mock_cwd.resolve.return_value = Path(temp_dir)
                 mock_path_class.return_value = mock_cwd
 
-                with patch('builtins.print') as mock_print:
-                    result = new_project(mock_emb, mock_store)
+                result = new_project(mock_emb, mock_store)
 
         assert result == 0
 
@@ -285,16 +315,15 @@ class TestNewProjectCommand:
         assert doc_call[0][1] == "Generated documentation"
 
     @patch('vector_memory.cli.main._env_get')
-    def test_new_project_missing_env(self, mock_env_get):
+    def test_new_project_missing_env(self, mock_env_get, capsys):
         """Test new project fails when MEMORY_COLLECTION_NAME not set."""
         mock_env_get.return_value = None
 
-        with patch('builtins.print') as mock_print:
-            result = new_project(Mock(), Mock())
+        result = new_project(Mock(), Mock())
 
         assert result == 2
-        mock_print.assert_called_once()
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
+        assert call_args.count("\n") == 1
         error_data = json.loads(call_args)
         assert error_data["status"] == "error"
         assert "MEMORY_COLLECTION_NAME is not set" in error_data["error"]
@@ -305,7 +334,7 @@ class TestNewProjectCommand:
     @patch('vector_memory.cli.main._generate_doc')
     @patch('vector_memory.cli.main._list_additional_collections')
     def test_new_project_files_exist(self, mock_additional, mock_generate_doc,
-                                    mock_write_file, mock_use_case_class, mock_env_get):
+                                    mock_write_file, mock_use_case_class, mock_env_get, capsys):
         """Test new project when files already exist."""
         mock_env_get.return_value = "existing_project"
         mock_additional.return_value = []
@@ -318,13 +347,12 @@ class TestNewProjectCommand:
 
         with tempfile.TemporaryDirectory():
             with patch('vector_memory.cli.main.Path'):
-                with patch('builtins.print') as mock_print:
-                    result = new_project(mock_emb, Mock())
+                result = new_project(mock_emb, Mock())
 
         assert result == 0
 
         # Verify output indicates files were not created
-        call_args = mock_print.call_args[0][0]
+        call_args = capsys.readouterr().out
         output_data = json.loads(call_args)
         assert output_data["mcp_shim_created"] is False
         assert output_data["doc_created"] is False
@@ -349,10 +377,10 @@ class TestNewProjectCommand:
                 mock_cwd = Mock()
                 mock_cwd.resolve.return_value = Path(temp_dir)
                 mock_cwd.__truediv__ = lambda self, other: shim_path if "mcp_vector_memory.py" in str(other) else Path(temp_dir) / str(other)
+                mock_cwd.read_text.return_value = ""  # Path(".env") is this mock too
                 mock_path_class.return_value = mock_cwd
 
-                with patch('builtins.print'):
-                    result = new_project(mock_emb, Mock())
+                result = new_project(mock_emb, Mock())
 
         assert result == 0
         # Should complete successfully even if chmod fails
@@ -394,6 +422,13 @@ class TestMCPShimContent:
 
         assert content.startswith("#!/usr/bin/env python3")
 
+    def test_shim_content_imports_standalone(self):
+        """Test the shim module body executes on its own (no references to CLI internals)."""
+        namespace = {"__name__": "vector_memory_mcp_shim"}
+        exec(compile(_SHIM_CONTENT, "vector_memory_mcp.py", "exec"), namespace)
+
+        assert callable(namespace["main"])
+
     def test_shim_content_error_handling(self):
         """Test shim includes error handling."""
         content = _SHIM_CONTENT
@@ -412,7 +447,7 @@ class TestProjectInitIntegration:
         'MEMORY_COLLECTION_NAME_2': 'integration_secondary'
     })
     @patch('vector_memory.cli.main.EnsureCollectionUseCase')
-    def test_complete_initialization_workflow(self, mock_use_case_class):
+    def test_complete_initialization_workflow(self, mock_use_case_class, capsys):
         """Test complete project initialization from environment setup to file creation."""
         mock_emb = Mock()
         mock_emb.get_dimension.return_value = 1024
@@ -428,8 +463,7 @@ class TestProjectInitIntegration:
                 import os
                 os.chdir(temp_dir)
 
-                with patch('builtins.print') as mock_print:
-                    result = new_project(mock_emb, mock_store)
+                result = new_project(mock_emb, mock_store)
 
                 assert result == 0
 
@@ -449,7 +483,7 @@ class TestProjectInitIntegration:
                 assert "integration_secondary" in doc_content
 
                 # Verify output
-                output_data = json.loads(mock_print.call_args[0][0])
+                output_data = json.loads(capsys.readouterr().out)
                 assert output_data["status"] == "ok"
                 assert output_data["collection"] == "integration_test"
                 assert output_data["dimension"] == 1024
@@ -0,0 +1,197 @@
+"""
+Unit tests for the upsert use case: embedding cache, ID policy, and payload shaping.
+
+Tests UpsertMemoryUseCase against mocked embedding and vector store ports.
+"""
+
+from unittest.mock import Mock
+import pytest
+
+from vector_memory.application.dto import UpsertMemoryRequest
+from vector_memory.application.embedding_cache import EmbeddingCache
+from vector_memory.application.use_cases.upsert_memory import UpsertMemoryUseCase
+from vector_memory.domain.models import MemoryItem, Vector
+
+
+def _fake_embedder(dim=3):
+    """Embedding port stub returning a distinct vector per text."""
+    emb = Mock()
+    emb.embed_texts.side_effect = lambda texts: [
+        Vector(values=[float(len(t))] * dim, dim=dim) for t in texts
+    ]
+    return emb
+
+
+class TestEmbeddingCache:
+    """Test content-hash caching of embeddings across upserts."""
+
+    def test_repeat_texts_skip_provider(self):
+        """Test a second upsert of identical texts embeds nothing."""
+        emb = _fake_embedder()
+        store = Mock()
+        store.upsert_points.return_value = {"status": "ok"}
+        use_case = UpsertMemoryUseCase(emb, store, cache=EmbeddingCache(16))
+        req = UpsertMemoryRequest(
+            collection="c",
+            items=[MemoryItem(text="alpha", meta={}), MemoryItem(text="beta", meta={})],
+        )
+
+        use_case.execute(req)
+        use_case.execute(req)
+
+        emb.embed_texts.assert_called_once_with(["alpha", "beta"])
+        assert store.upsert_points.call_count == 2
+
+    def test_only_misses_are_embedded_in_order(self):
+        """Test partial hits embed only new texts and keep point order."""
+        emb = _fake_embedder()
+        store = Mock()
+        use_case = UpsertMemoryUseCase(emb, store, cache=EmbeddingCache(16))
+
+        use_case.execute(UpsertMemoryRequest(collection="c", items=[MemoryItem(text="bb", meta={})]))
+        use_case.execute(UpsertMemoryRequest(
+            collection="c",
+            items=[MemoryItem(text="a", meta={}), MemoryItem(text="bb", meta={}), MemoryItem(text="cccc", meta={})],
+        ))
+
+        assert emb.embed_texts.call_args_list[-1][0][0] == ["a", "cccc"]
+        points = store.upsert_points.call_args[0][1]
+        assert [p.vector.values[0] for p in points] == [1.0, 2.0, 4.0]
+
+    def test_duplicate_texts_embedded_once(self):
+        """Test repeated texts within one request are embedded once and fanned back out."""
+        emb = _fake_embedder()
+        store = Mock()
+        use_case = UpsertMemoryUseCase(emb, store, cache=EmbeddingCache(0))
+
+        use_case.execute(UpsertMemoryRequest(
+            collection="c",
+            items=[MemoryItem(text=t, meta={}) for t in ("a", "bb", "a", "bb", "ccc")],
+        ))
+
+        emb.embed_texts.assert_called_once_with(["a", "bb", "ccc"])
+        points = store.upsert_points.call_args[0][1]
+        assert [p.vector.values[0] for p in points] == [1.0, 2.0, 1.0, 2.0, 3.0]
+        assert points[0].vector is points[2].vector
+
+    def test_cached_vector_instances_reused_in_points(self):
+        """Test points carry the embedding Vector itself rather than a copy."""
+        emb = _fake_embedder()
+        store = Mock()
+        cache = EmbeddingCache(16)
+        UpsertMemoryUseCase(emb, store, cache=cache).execute(
+            UpsertMemoryRequest(collection="c", items=[MemoryItem(text="abc", meta={})])
+        )
+
+        from vector_memory.infrastructure.config import embed_model
+
+        point = store.upsert_points.call_args[0][1][0]
+        assert point.vector is cache.get_many([EmbeddingCache.key(embed_model(), "abc")])[0]
+
+    def test_all_hits_returned_without_provider(self):
+        """Test a request made entirely of cached texts upserts the cached vectors, not an empty batch."""
+        emb = _fake_embedder()
+        store = Mock()
+        use_case = UpsertMemoryUseCase(emb, store, cache=EmbeddingCache(16))
+        req = UpsertMemoryRequest(
+            collection="c",
+            items=[MemoryItem(text="a", meta={}), MemoryItem(text="bb", meta={})],
+        )
+        use_case.execute(req)
+        emb.embed_texts.side_effect = None
+        emb.embed_texts.return_value = []
+
+        use_case.execute(req)
+
+        emb.embed_texts.assert_called_once()
+        points = store.upsert_points.call_args[0][1]
+        assert [p.vector.values[0] for p in points] == [1.0, 2.0]
+
+    def test_empty_provider_answer_with_hits_raises(self):
+        """Test cached vectors are not silently dropped when the provider returns nothing for the misses."""
+        from vector_memory.domain.errors import EmbeddingError
+
+        emb = _fake_embedder()
+        use_case = UpsertMemoryUseCase(emb, Mock(), cache=EmbeddingCache(16))
+        use_case.execute(UpsertMemoryRequest(collection="c", items=[MemoryItem(text="a", meta={})]))
+        emb.embed_texts.side_effect = None
+        emb.embed_texts.return_value = []
+
+        with pytest.raises(EmbeddingError):
+            use_case.execute(UpsertMemoryRequest(
+                collection="c",
+                items=[MemoryItem(text="a", meta={}), MemoryItem(text="new", meta={})],
+            ))
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted past maxsize."""
+        cache = EmbeddingCache(2)
+        v = Vector(values=[0.0], dim=1)
+        k1, k2, k3 = (EmbeddingCache.key("m", t) for t in ("1", "2", "3"))
+
+        cache.put_many([(k1, v), (k2, v)])
+        cache.get_many([k1])  # touch k1 so k2 becomes the eviction candidate
+        cache.put_many([(k3, v)])
+
+        assert cache.get_many([k1, k2, k3]) == [v, None, v]
+
+    def test_zero_size_disables_cache(self):
+        """Test maxsize=0 never stores vectors."""
+        emb = _fake_embedder()
+        use_case = UpsertMemoryUseCase(emb, Mock(), cache=EmbeddingCache(0))
+        req = UpsertMemoryRequest(collection="c", items=[MemoryItem(text="x", meta={})])
+
+        use_case.execute(req)
+        use_case.execute(req)
+
+        assert emb.embed_texts.call_count == 2
+
+    def test_short_provider_response_raises(self):
+        """Test a provider returning too few vectors surfaces an EmbeddingError."""
+        from vector_memory.domain.errors import EmbeddingError
+
+        emb = Mock()
+        emb.embed_texts.return_value = [Vector(values=[0.1], dim=1)]
+        use_case = UpsertMemoryUseCase(emb, Mock(), cache=EmbeddingCache(16))
+        req = UpsertMemoryRequest(
+            collection="c",
+            items=[MemoryItem(text="one", meta={}), MemoryItem(text="two", meta={})],
+        )
+
+        with pytest.raises(EmbeddingError):
+            use_case.execute(req)
+
+
+class TestDimensionCheck:
+    """Test embedding dimension validation."""
+
+    def test_mismatched_dimension_raises(self):
+        """Test a vector with a different dim is reported with the offending size."""
+        emb = Mock()
+        emb.embed_texts.return_value = [Vector(values=[0.1, 0.2], dim=2), Vector(values=[0.1], dim=1)]
+        use_case = UpsertMemoryUseCase(emb, Mock(), cache=EmbeddingCache(0))
+        req = UpsertMemoryRequest(
+            collection="c",
+            items=[MemoryItem(text="one", meta={}), MemoryItem(text="two", meta={})],
+        )
+
+        with pytest.raises(ValueError, match="got 1, expected 2"):
+            use_case.execute(req)
+
+
+class TestPointIds:
+    """Test deterministic point ID generation."""
+
+    @pytest.mark.parametrize("namespace,source,text", [
+        ("mem", "memory-bank/a.md", "# Title\n\nBody"),
+        ("chat", "chat:t:0:user:0", "unicode ✓ naïve"),
+        ("", "", ""),
+        ("ns|ü", "a|b", "x"),
+    ])
+    def test_make_uuid_matches_uuid5(self, namespace, source, text):
+        """Test IDs stay byte-identical to uuid.uuid5 so re-upserts remain idempotent."""
+        import uuid
+        from vector_memory.application.use_cases.upsert_memory import _make_uuid
+
+        expected = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{namespace}|{source}|{text}"))
+        assert _make_uuid(namespace, source, text) == expected
@@ -128,10 +128,7 @@ query_block_for_prompt() {
     echo ""
     return 0
   fi
-  if ! command -v jq >/dev/null 2>&1; then
-    echo ""
-    return 0
-  fi
+  # jq presence is checked once at startup (require_cmd jq); no per-prompt PATH lookup.
   local has
   has="$(printf '%s' "${json}" | jq -r '((.result // []) | length) >= 1')"
   if [[ "${has}" != "true" ]]; then
@@ -75,24 +75,42 @@ read_lock() {
 choose_latest_thread_dir() {
   local latest_dir=""
   local latest_ts=-1
-  local d ts
-
-  # Iterate immediate children directories under ROO_TASKS_DIR
-  while IFS= read -r -d '' d; do
-    local ui="${d}/ui_messages.json"
-    local api="${d}/api_conversation_history.json"
-    local ts_ui=0 ts_api=0 ts_dir=0
-    [[ -f "${ui}" ]] && ts_ui="$(stat -c %Y "${ui}" 2>/dev/null || echo 0)"
-    [[ -f "${api}" ]] && ts_api="$(stat -c %Y "${api}" 2>/dev/null || echo 0)"
-    ts_dir="$(stat -c %Y "${d}" 2>/dev/null || echo 0)"
-    ts="${ts_ui}"
-    [[ "${ts_api}" -gt "${ts}" ]] && ts="${ts_api}"
-    [[ "${ts_dir}" -gt "${ts}" ]] && ts="${ts_dir}"
+  local rec depth kind target ts path d
+  local -a dirs=()
+  local -A dir_ts=()
+
+  # One find pass lists every task dir and its target files with mtimes (instead of three
+  # `stat` processes per task dir). Pre-order output keeps task dirs in the same order as before.
+  # %y is the entry's own type (task dirs: like `-type d`, symlinks excluded); %Y follows
+  # symlinks (marker files: like `[[ -f ]]`).
+  while IFS= read -r -d '' rec; do
+    depth="${rec%% *}"; rec="${rec#* }"
+    kind="${rec%% *}"; rec="${rec#* }"
+    target="${rec%% *}"; rec="${rec#* }"
+    ts="${rec%% *}"; path="${rec#* }"
+    ts="${ts%%.*}"
+    if [[ "${depth}" == 1 ]]; then
+      [[ "${kind}" == d ]] || continue
+      dirs+=("${path}")
+      dir_ts["${path}"]="${ts}"
+      continue
+    fi
+    [[ "${target}" == f ]] || continue
+    case "${path##*/}" in
+      ui_messages.json|api_conversation_history.json) ;;
+      *) continue ;;
+    esac
+    d="${path%/*}"
+    [[ -n "${dir_ts[${d}]+x}" && "${ts}" -gt "${dir_ts[${d}]}" ]] && dir_ts["${d}"]="${ts}"
+  done < <(find "${ROO_TASKS_DIR}" -mindepth 1 -maxdepth 2 -printf '%d %y %Y %T@ %p\0' 2>/dev/null)
+
+  for d in "${dirs[@]}"; do
+    ts="${dir_ts[${d}]}"
     if [[ "${ts}" -gt "${latest_ts}" ]]; then
       latest_ts="${ts}"
       latest_dir="${d}"
     fi
-  done < <(find "${ROO_TASKS_DIR}" -mindepth 1 -maxdepth 1 -type d -print0)
+  done
 
   if [[ -z "${latest_dir}" ]]; then
     echo ""  # none found
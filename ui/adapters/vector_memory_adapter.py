@@ -120,7 +120,8 @@ class VectorMemoryAdapter(IVectorMemoryService):
             ensure = self._EnsureCollectionUseCase(embeddings=emb, store=store)
             ensure.execute(self._EnsureCollectionRequest(collection=collection, dim=None, distance="Cosine", recreate=False))
 
-            mem_items = [self._MemoryItem(text=str(it.get("text", "")), meta=dict(it.get("meta", {}))) for it in items if str(it.get("text", "")).strip()]
+            # Items may share one meta dict (see VectorPromptService.insert_many); MemoryItem meta is read-only.
+            mem_items = [self._MemoryItem(text=str(it.get("text", "")), meta=it.get("meta") or {}) for it in items if str(it.get("text", "")).strip()]
             if not mem_items:
                 return
             req = self._UpsertMemoryRequest(collection=collection, items=mem_items, id_namespace=id_namespace)
@@ -242,7 +242,7 @@ class VectorPromptService:
             s = (t or "").strip()
             if not s:
                 continue
-            items.append({"text": s, "meta": base.copy()})
+            items.append({"text": s, "meta": base})  # shared: metadata is read-only downstream
         if not items:
             return 0
         try: